@@ -1,11 +1,18 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-from openai import AzureOpenAI
-import json
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional, Dict, Any, Tuple
+from collections import OrderedDict
+from openai import AsyncAzureOpenAI, APIConnectionError, InternalServerError, RateLimitError
+import httpx
+import asyncio
+import hashlib
+import orjson
 import os
 import logging
 import re
+import tiktoken
+
+from app.services.cache.redis_cache import cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -15,19 +22,76 @@ DEPLOYMENT = "gpt-4.1"
 API_VERSION = "2024-12-01-preview"
 API_KEY = os.environ.get("AZURE_AI_FOUNDRY_API_KEY")
 
+# Batch API deployment (must be a Global-Batch deployment of the same model)
+BATCH_DEPLOYMENT = os.environ.get("AZURE_OPENAI_BATCH_DEPLOYMENT", DEPLOYMENT)
+
+# Cleaned text up to this size goes to GPT-4 whole - extract_financial_context falls
+# back to the first 3000 characters anyway, so ranking lines can't shrink it
+SMALL_TEXT_THRESHOLD = 3_000
+
+# Short records are packed into one GPT-4 call to save a round-trip each.
+# Output budget is max_tokens per record, so keep groups small.
+BATCHED_RECORD_MAX_CHARS = 4_000
+BATCHED_PROMPT_CHAR_LIMIT = 12_000
+BATCHED_MAX_RECORDS = 5
+
+# Max concurrent GPT-4 calls across all extraction endpoints (Azure rate limits)
+EXTRACTION_CONCURRENCY = int(os.environ.get("FIN_EXTRACT_CONCURRENCY", "8"))
+
+# Records mentioning fewer distinct FINANCIAL_KEYWORDS than this (cover pages, stray
+# notes) return empty data and a warning without a GPT-4 call - 0 sends everything.
+# Records carrying a primary statement title are always sent.
+MIN_FINANCIAL_KEYWORDS = int(os.environ.get("FIN_EXTRACT_MIN_KEYWORDS", "3"))
+
+# Input budget for one document - texts beyond this are cut on a token boundary
+MAX_INPUT_TOKENS = int(os.environ.get("FIN_EXTRACT_MAX_INPUT_TOKENS", "30000"))
+
+# Extractions are deterministic enough (temperature 0.01) to reuse across reprocessing runs
+EXTRACTION_CACHE_TTL = 30 * 24 * 3600
+EXTRACTION_MEMORY_CACHE_SIZE = 1024  # Per-worker LRU in front of Redis for retry storms
+
+# Hard ceiling for one streamed completion, including SDK retries
+EXTRACTION_TIMEOUT = 180.0
+
+# SDK retry attempts for 408/409/429/5xx and connection errors (exponential backoff with jitter)
+EXTRACTION_MAX_RETRIES = int(os.environ.get("FIN_EXTRACT_MAX_RETRIES", "5"))
+
+# Failures that outlast the SDK retries are raised instead of becoming all-null results,
+# so the skill reports a record error and the indexer retries it rather than indexing nulls
+TRANSIENT_EXTRACTION_ERRORS = (RateLimitError, APIConnectionError, InternalServerError, TimeoutError)
+
+# Shared async client - reuses the underlying httpx connection pool across requests
+# without tying up a thread per call. The SDK retries 408/409/429/5xx with
+# exponential backoff; fail fast on connect.
+_AOAI_CLIENT = AsyncAzureOpenAI(
+    api_version=API_VERSION,
+    azure_endpoint=ENDPOINT,
+    api_key=API_KEY,
+    max_retries=EXTRACTION_MAX_RETRIES,
+    timeout=httpx.Timeout(60.0, connect=5.0),
+) if API_KEY else None
+
+if _AOAI_CLIENT is None:
+    logger.warning("Azure AI API key not configured - extraction endpoints will return 500")
+
 router = APIRouter()
 
+_EXTRACTION_SEMAPHORE = asyncio.Semaphore(EXTRACTION_CONCURRENCY)
+_EXTRACTION_MEMORY_CACHE: "OrderedDict[str, FinancialData]" = OrderedDict()
+
 # Define TextSection FIRST
+# Only content is used downstream - locationMetadata/sections are ignored rather than validated
 class TextSection(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    
     id: str
     content: str
-    locationMetadata: Optional[Dict[str, Any]] = None
-    sections: Optional[List[Any]] = None
 
 # Then define InputData that uses TextSection
 class InputData(BaseModel):
     text: Optional[str] = None
     text_sections: Optional[List[TextSection]] = None
+    pre_cleaned: bool = False  # Sections already went through the text cleaning skill
 
 class RecordValue(BaseModel):
     recordId: str
@@ -37,6 +101,8 @@ class SkillRequest(BaseModel):
     values: List[RecordValue]
 
 class FinancialData(BaseModel):
+    model_config = ConfigDict(extra='ignore', ser_json_inf_nan='null')
+    
     is_abridged: Optional[bool] = None
     revenue: Optional[float] = None
     turnover: Optional[float] = None
@@ -99,68 +165,132 @@ class FinancialData(BaseModel):
     document_type: Optional[str] = None
     profit_loss_filed: Optional[bool] = None
 
+# Document metadata comes from detect_abridged_accounts and the ratios are not extracted,
+# so every other FinancialData field is read from the GPT-4 response
+EXTRACTED_FIELDS = tuple(
+    name for name in FinancialData.model_fields
+    if name not in ("is_abridged", "document_type", "profit_loss_filed",
+                    "gross_margin", "operating_margin", "debt_to_equity_ratio")
+)
+
+# Strict structured output - every extracted field, number or null, nothing else.
+# The model can't return malformed or partial JSON, so parse failures go away.
+FINANCIAL_RECORD_SCHEMA = {
+    "type": "object",
+    "properties": {field: {"type": ["number", "null"]} for field in EXTRACTED_FIELDS},
+    "required": list(EXTRACTED_FIELDS),
+    "additionalProperties": False
+}
+
+
+def extraction_response_format(records: Optional[int] = None) -> Dict[str, Any]:
+    """
+    json_schema response format for one record, or for `records` records keyed "0", "1", ...
+    """
+    schema = FINANCIAL_RECORD_SCHEMA
+    if records is not None:
+        keys = [str(i) for i in range(records)]
+        schema = {
+            "type": "object",
+            "properties": {key: FINANCIAL_RECORD_SCHEMA for key in keys},
+            "required": keys,
+            "additionalProperties": False
+        }
+    
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "financial_data", "strict": True, "schema": schema}
+    }
+
+
+# Chat completion settings shared by the live and batch extraction paths
+EXTRACTION_PARAMS = {
+    "temperature": 0.01,  # Extremely low for maximum consistency
+    "max_tokens": 1200,   # A full record is ~600-800 tokens; caps runaway generations
+    "response_format": extraction_response_format()
+}
+
+# All-None result for error paths. Skill responses share it read-only; values handed
+# to other callers are shallow copies, which skip FinancialData's __init__
+EMPTY_FINANCIAL_DATA = FinancialData()
+
 class RecordError(BaseModel):
     message: str
 
+class RecordWarning(BaseModel):
+    message: str
+
 class RecordResult(BaseModel):
     recordId: str
     data: FinancialData
     errors: Optional[List[RecordError]] = None
+    warnings: Optional[List[RecordWarning]] = None
 
 class SkillResponse(BaseModel):
     values: List[RecordResult]
 
+# Cleaning patterns are compiled once at import - the functions below run on every record
+OCR_ARTIFACT_PATTERNS = (
+    # Remove coordinate/metadata artifacts
+    (re.compile(r'\{[^}]*\}'), ''),  # Remove JSON objects
+    (re.compile(r'boundingPolygons.*?\]\]'), ''),  # Remove coordinates
+    (re.compile(r'pageNumber.*?\d+'), ''),  # Remove page references
+    (re.compile(r'ordinalPosition.*?\d+'), ''),  # Remove position data
+    (re.compile(r'locationMetadata.*?sections'), ''),  # Remove location data
+    # Remove common OCR scanning artifacts
+    (re.compile(r'FRIDAY\*[A-Z0-9\*\[\]]+'), ''),  # Remove scan codes
+    (re.compile(r'COMPANIES HOUSE#\d+'), ''),  # Remove filing references
+    (re.compile(r'A\d+\s+\d{2}/\d{2}/\d{4}'), ''),  # Remove date stamps
+    # Remove duplicate document headers - spelled out so the pattern starts with a literal
+    # the regex engine can search for, instead of trying a group at every position
+    (re.compile(r'WEST BROMWICH ALBION FOOTBALL CLUB LIMITED\s*(?:WEST BROMWICH ALBION FOOTBALL CLUB LIMITED\s*)+'),
+     'WEST BROMWICH ALBION FOOTBALL CLUB LIMITED '),
+)
+
 def remove_ocr_artifacts(text: str) -> str:
     """
     Remove OCR scanning artifacts and metadata - THIS WAS MISSING!
     """
-    
-    # Remove coordinate/metadata artifacts
-    text = re.sub(r'\{[^}]*\}', '', text)  # Remove JSON objects
-    text = re.sub(r'boundingPolygons.*?\]\]', '', text)  # Remove coordinates
-    text = re.sub(r'pageNumber.*?\d+', '', text)  # Remove page references
-    text = re.sub(r'ordinalPosition.*?\d+', '', text)  # Remove position data
-    text = re.sub(r'locationMetadata.*?sections', '', text)  # Remove location data
-    
-    # Remove common OCR scanning artifacts
-    text = re.sub(r'FRIDAY\*[A-Z0-9\*\[\]]+', '', text)  # Remove scan codes
-    text = re.sub(r'COMPANIES HOUSE#\d+', '', text)  # Remove filing references
-    text = re.sub(r'A\d+\s+\d{2}/\d{2}/\d{4}', '', text)  # Remove date stamps
-    
-    # Remove duplicate document headers
-    text = re.sub(r'(WEST BROMWICH ALBION FOOTBALL CLUB LIMITED\s*){2,}', 
-                  'WEST BROMWICH ALBION FOOTBALL CLUB LIMITED ', text)
+    for pattern, replacement in OCR_ARTIFACT_PATTERNS:
+        text = pattern.sub(replacement, text)
     
     return text
 
+DIRECTORS_PATTERN = re.compile(r'Directors([A-Z][a-z]+(?:[A-Z][a-z]+)*)')
+NAME_PART_PATTERN = re.compile(r'[A-Z][a-z]+')
+COMPANY_INFO_PATTERNS = (
+    # Fix company number formatting
+    (re.compile(r'Company number(\d+)'), r'Company number: \1'),
+    # Fix address formatting: remove excessive concatenation
+    (re.compile(r'United Kingdom([A-Z0-9 ]+)'), r'United Kingdom \1'),
+    # Clean up audit information
+    (re.compile(r'Auditor([A-Z])'), r'Auditor: \1'),
+)
+
 def clean_company_info(text: str) -> str:
     """
     Clean up director names and company information - THIS WAS MISSING!
     """
     
     # Fix concatenated director names: "DirectorsM MilesS Patel" -> "Directors: M Miles, S Patel"
-    text = re.sub(r'Directors([A-Z][a-z]+(?:[A-Z][a-z]+)*)', 
-                  lambda m: f"Directors: {' '.join(re.findall(r'[A-Z][a-z]+', m.group(1)))}", text)
+    text = DIRECTORS_PATTERN.sub(
+        lambda m: f"Directors: {' '.join(NAME_PART_PATTERN.findall(m.group(1)))}", text)
     
-    # Fix company number formatting
-    text = re.sub(r'Company number(\d+)', r'Company number: \1', text)
-    
-    # Fix address formatting: remove excessive concatenation
-    text = re.sub(r'United Kingdom([A-Z0-9 ]+)', r'United Kingdom \1', text)
-    
-    # Clean up audit information
-    text = re.sub(r'Auditor([A-Z])', r'Auditor: \1', text)
+    for pattern, replacement in COMPANY_INFO_PATTERNS:
+        text = pattern.sub(replacement, text)
     
     return text
 
+
 def clean_ocr_text(text: str) -> str:
     """
     Clean OCR text to fix common formatting issues before GPT extraction
     """
     
-    # Remove excessive whitespace and newlines
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-    text = re.sub(r'\s+', ' ', text)
+    # Remove excessive whitespace and newlines - every run collapses to one space,
+    # so a separate blank-line pass first would be overwritten anyway. split()/join
+    # matches the same characters as \s but runs in C without the regex engine.
+    text = ' '.join(text.split())
     
     # ENHANCED: Remove OCR artifacts and metadata first
     text = remove_ocr_artifacts(text)
@@ -175,49 +305,100 @@ def clean_ocr_text(text: str) -> str:
     
     return text.strip()
 
+NUMBER_FORMAT_PATTERNS = (
+    # Fix concatenated parentheses: "123,456( 789,012)" -> "123,456 (789,012)"
+    # (this also covers every missing space before a parenthesis in financial data)
+    (re.compile(r'(\d)\('), r'\1 ('),
+    # Fix concatenated numbers: "123,456789,012" -> "123,456 789,012"
+    (re.compile(r'(\d{1,3}(?:,\d{3})*[^\s,\d])(\d)'), r'\1 \2'),
+    # Add space after currency symbols
+    (re.compile(r'£(\d)'), r'£ \1'),
+)
+
 def fix_number_formatting(text: str) -> str:
     """
     Fix common number formatting issues in OCR text
     """
-    
-    # Fix concatenated parentheses: "123,456( 789,012)" -> "123,456 (789,012)"
-    text = re.sub(r'(\d)(\()', r'\1 \2', text)
-    
-    # Fix missing spaces before parentheses in financial data
-    text = re.sub(r'(\d)\(', r'\1 (', text)
-    
-    # Fix concatenated numbers: "123,456789,012" -> "123,456 789,012"
-    text = re.sub(r'(\d{1,3}(?:,\d{3})*[^\s,\d])(\d)', r'\1 \2', text)
-    
-    # Add space after currency symbols
-    text = re.sub(r'£(\d)', r'£ \1', text)
+    for pattern, replacement in NUMBER_FORMAT_PATTERNS:
+        text = pattern.sub(replacement, text)
     
     return text
 
+# Common financial terms that get stuck to numbers
+FINANCIAL_LABEL_TERMS = (
+    'Cash at bank', 'Net assets', 'Total assets', 'Turnover', 'Revenue',
+    'Creditors', 'Profit', 'Loss', 'Tax', 'Interest', 'Broadcasting',
+    'Commercial', 'Matchday', 'Player', 'Wages', 'Transfer', 'Stadium',
+    'Company number', 'Registration number'  # Added more terms
+)
+
+# (label-then-digit, digit-then-label) pattern pair per term, applied in term order
+FINANCIAL_LABEL_PATTERNS = tuple(
+    (re.compile(rf'({re.escape(term)})(\d)', re.IGNORECASE),
+     re.compile(rf'(\d)({re.escape(term)})', re.IGNORECASE))
+    for term in FINANCIAL_LABEL_TERMS
+)
+
+# Case-sensitive alternations run over the lowered text - a fraction of the cost of
+# 38 IGNORECASE passes. Lookaheads keep the digits unconsumed so adjacent fixes still match.
+_FINANCIAL_LABEL_ALTERNATION = '|'.join(re.escape(term.lower()) for term in FINANCIAL_LABEL_TERMS)
+LABEL_BEFORE_DIGIT_PATTERN = re.compile(rf'(?:{_FINANCIAL_LABEL_ALTERNATION})(?=\d)')
+DIGIT_BEFORE_LABEL_PATTERN = re.compile(rf'\d(?={_FINANCIAL_LABEL_ALTERNATION})')
+
+# IGNORECASE folds these onto term letters but str.lower() leaves them alone
+CASE_FOLD_EXCEPTIONS = ('ı', 'ſ')
+
 def fix_financial_labels(text: str) -> str:
     """
     Fix concatenated financial labels with numbers
     """
     
-    # Common financial terms that get stuck to numbers
-    financial_terms = [
-        'Cash at bank', 'Net assets', 'Total assets', 'Turnover', 'Revenue',
-        'Creditors', 'Profit', 'Loss', 'Tax', 'Interest', 'Broadcasting',
-        'Commercial', 'Matchday', 'Player', 'Wages', 'Transfer', 'Stadium',
-        'Company number', 'Registration number'  # Added more terms
-    ]
+    # Each fix only inserts a separator at a term/digit boundary of the original text and
+    # never creates or removes another, so all boundaries can be found up front and spliced in
+    lowered = text.lower()
+    if len(lowered) != len(text) or any(char in text for char in CASE_FOLD_EXCEPTIONS):
+        # Offsets in lowered would not line up with text - use the per-term passes
+        return fix_financial_labels_per_term(text)
+    
+    # Fix cases like "Cash at bank123,456" -> "Cash at bank: 123,456"
+    inserts = [(m.end(), ': ') for m in LABEL_BEFORE_DIGIT_PATTERN.finditer(lowered)]
+    
+    # Fix cases like "123,456Cash at bank" -> "123,456 Cash at bank"
+    inserts += [(m.end(), ' ') for m in DIGIT_BEFORE_LABEL_PATTERN.finditer(lowered)]
+    
+    if not inserts:
+        return text
+    
+    inserts.sort()
+    parts = []
+    last = 0
+    for position, separator in inserts:
+        parts.append(text[last:position])
+        parts.append(separator)
+        last = position
+    parts.append(text[last:])
     
-    for term in financial_terms:
+    return ''.join(parts)
+
+def fix_financial_labels_per_term(text: str) -> str:
+    """
+    Fix concatenated financial labels with numbers, one IGNORECASE pass per term
+    """
+    
+    for label_digit, digit_label in FINANCIAL_LABEL_PATTERNS:
         # Fix cases like "Cash at bank123,456" -> "Cash at bank: 123,456"
-        pattern = f'({re.escape(term)})(\d)'
-        text = re.sub(pattern, r'\1: \2', text, flags=re.IGNORECASE)
+        text = label_digit.sub(r'\1: \2', text)
         
         # Fix cases like "123,456Cash at bank" -> "123,456 Cash at bank"  
-        pattern = f'(\d)({re.escape(term)})'
-        text = re.sub(pattern, r'\1 \2', text, flags=re.IGNORECASE)
+        text = digit_label.sub(r'\1 \2', text)
     
     return text
 
+# Capitalised words and upper-case statement starts share one pass - the inserted
+# space can't create or remove a match for the other alternatives
+DIGIT_WORD_PATTERN = re.compile(r'(\d)([A-Z][a-z]|PROFIT|LOSS|REVENUE|TURNOVER|CASH|NET|TOTAL|TAX)')
+PAGE_REFERENCE_PATTERN = re.compile(r'(\w)(Page\s*\d+)', re.IGNORECASE)
+
 def separate_concatenated_items(text: str) -> str:
     """
     Separate concatenated financial statement items
@@ -226,50 +407,66 @@ def separate_concatenated_items(text: str) -> str:
     # Separate items that are commonly concatenated in OCR
     # Example: "PROFIT BEFORE TAXATION3,334,238Interest receivable108,574"
     
-    # Add space before capital letters that follow numbers
-    text = re.sub(r'(\d)([A-Z][a-z])', r'\1 \2', text)
-    
-    # Add space before common financial statement starts
-    financial_starts = ['PROFIT', 'LOSS', 'REVENUE', 'TURNOVER', 'CASH', 'NET', 'TOTAL', 'TAX']
-    for start in financial_starts:
-        text = re.sub(f'(\d)({start})', r'\1 \2', text)
+    # Add space before capital letters and common financial statement starts that follow numbers
+    text = DIGIT_WORD_PATTERN.sub(r'\1 \2', text)
     
     # Fix concatenated page references
-    text = re.sub(r'(\w)(Page\s*\d+)', r'\1 \2', text, flags=re.IGNORECASE)
+    text = PAGE_REFERENCE_PATTERN.sub(r'\1 \2', text)
     
     return text
 
+# Key financial statement keywords (lowercase) used to rank lines in extract_financial_context
+FINANCIAL_KEYWORDS = (
+    'profit and loss', 'balance sheet', 'cash flow', 'income statement',
+    'revenue', 'turnover', 'broadcasting', 'commercial', 'matchday',
+    'player wages', 'staff costs', 'amortisation', 'transfer',
+    'cash at bank', 'net assets', 'creditors', 'liabilities'
+)
+
+# r'\d{1,3}(?:,\d{3})*' matches as soon as any digit is present, so a set test is equivalent
+DIGITS = frozenset('0123456789')
+
+# Primary statement titles - a short micro-entity balance sheet can name few line items,
+# so a record carrying one of these is never skipped by the keyword threshold
+STATEMENT_TITLES = (
+    'balance sheet', 'statement of financial position',
+    'profit and loss', 'income statement', 'statement of comprehensive income'
+)
+
+def has_financial_content(text: str) -> bool:
+    """
+    Whether a record is worth a GPT-4 call: it names a primary statement or
+    mentions at least MIN_FINANCIAL_KEYWORDS distinct financial keywords
+    """
+    lowered = text.lower()
+    if any(title in lowered for title in STATEMENT_TITLES):
+        return True
+    return sum(keyword in lowered for keyword in FINANCIAL_KEYWORDS) >= MIN_FINANCIAL_KEYWORDS
+
 def extract_financial_context(text: str) -> str:
     """
     Extract the most relevant financial sections from the full text
     """
     
-    # Look for key financial statement sections
-    financial_keywords = [
-        'profit and loss', 'balance sheet', 'cash flow', 'income statement',
-        'revenue', 'turnover', 'broadcasting', 'commercial', 'matchday',
-        'player wages', 'staff costs', 'amortisation', 'transfer',
-        'cash at bank', 'net assets', 'creditors', 'liabilities'  # Added more keywords
-    ]
-    
     # Split text into chunks and rank by financial relevance
     chunks = text.split('\n')
     relevant_chunks = []
     
     for chunk in chunks:
-        if len(chunk.strip()) < 10:  # Skip very short lines
+        stripped = chunk.strip()
+        if len(stripped) < 10:  # Skip very short lines
             continue
-            
-        # Count financial keywords in this chunk
-        keyword_count = sum(1 for keyword in financial_keywords 
-                          if keyword.lower() in chunk.lower())
         
-        # Include chunks with financial keywords or numbers
-        if keyword_count > 0 or re.search(r'\d{1,3}(?:,\d{3})*', chunk):
-            relevant_chunks.append(chunk)
+        # Include chunks with numbers or financial keywords - the digit test is cheaper
+        # and settles most statement lines without lowering them
+        if not DIGITS.isdisjoint(stripped) or any(keyword in stripped.lower() for keyword in FINANCIAL_KEYWORDS):
+            relevant_chunks.append(stripped)
+            # Only the first 100 are kept, so stop scanning once we have them
+            if len(relevant_chunks) == 100:
+                break
     
     # Return most relevant sections (limit to avoid token limits)
-    financial_text = '\n'.join(relevant_chunks[:100])  # Increased to 100 lines
+    financial_text = '\n'.join(relevant_chunks)  # Increased to 100 lines
     
     # If we didn't find much financial content, return cleaned original
     if len(financial_text) < 500:
@@ -277,64 +474,42 @@ def extract_financial_context(text: str) -> str:
     
     return financial_text
 
-def extract_text_from_sections(text_sections: List[TextSection]) -> str:
+def extract_text_from_sections(text_sections: List[TextSection], pre_cleaned: bool = False) -> str:
     """
-    Extract and combine text content from TextSection objects with cleaning
+    Extract and combine text content from TextSection objects with cleaning.
+    pre_cleaned skips the OCR cleaning when an upstream skill already did it.
     """
-    combined_text = ""
-    
-    for section in text_sections:
-        if section.content and section.content.strip():
-            # Skip sections that are just whitespace or coordinates
-            if len(section.content.strip()) > 10:  # Only meaningful content
-                combined_text += section.content + "\n"
+    # Skip sections that are just whitespace or coordinates - only meaningful content
+    combined_text = "\n".join(
+        section.content for section in text_sections
+        if section.content and len(section.content.strip()) > 10
+    )
     
     # Apply comprehensive text cleaning
-    cleaned_text = clean_ocr_text(combined_text)
+    if pre_cleaned:
+        cleaned_text = combined_text
+    else:
+        cleaned_text = clean_ocr_text(combined_text)
     
-    # Extract most relevant financial sections
-    financial_text = extract_financial_context(cleaned_text)
+    # Extract most relevant financial sections - small documents already fit
+    if len(cleaned_text) <= SMALL_TEXT_THRESHOLD:
+        financial_text = cleaned_text
+    else:
+        financial_text = extract_financial_context(cleaned_text)
     
-    print(f"DEBUG - Original text: {len(combined_text)} chars")
-    print(f"DEBUG - Cleaned text: {len(cleaned_text)} chars") 
-    print(f"DEBUG - Financial text: {len(financial_text)} chars")
-    print(f"DEBUG - Sample cleaned text: {financial_text[:500]}...")
+    logger.debug("Section text: %d original, %d cleaned, %d financial chars",
+                 len(combined_text), len(cleaned_text), len(financial_text))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sample cleaned text: %s...", financial_text[:500])
     
     return financial_text
 
-async def extract_financial_metrics_with_gpt4(text: str) -> FinancialData:
-    """
-    ENHANCED: GPT-4 extraction optimized for specific cleaned text patterns
-    Enhanced with comprehensive UK football accounting expertise
-    """
-    
-    if not API_KEY:
-        logger.error("Azure AI API key not configured")
-        raise HTTPException(status_code=500, detail="Azure AI API key not configured")
-    
-    # SIMPLIFIED: Basic validation only
-    if not text or len(text.strip()) < 10:
-        logger.warning(f"Insufficient text for extraction: {len(text) if text else 0} characters")
-        return FinancialData()
-    
-    try:
-        # STEP 1: Detect document type before extraction
-        document_info = detect_abridged_accounts(text)
-        
-        logger.info("Starting financial extraction with document type detection",
-                   text_length=len(text),
-                   is_abridged=document_info["is_abridged"],
-                   document_type=document_info["document_type"],
-                   profit_loss_filed=document_info["profit_loss_filed"])
-        
-        client = AzureOpenAI(
-            api_version=API_VERSION,
-            azure_endpoint=ENDPOINT,
-            api_key=API_KEY,
-        )
-        
-        # ENHANCED: System prompt with comprehensive UK football expertise
-        system_prompt = """You are a highly specialized UK chartered accountant with extensive experience in auditing and analyzing the financial statements of football clubs in the English Football League (Championship, League One, League Two) and the National League. Your expertise is rooted in a deep understanding of FRS 102, UK GAAP, and the Companies Act 2006.
+# Prompts are module constants and every static instruction lives in the system message,
+# so each request starts with the same bytes - Azure OpenAI prompt caching reuses that
+# whole prefix. The user message holds nothing but the document text.
+
+# ENHANCED: System prompt with comprehensive UK football expertise
+EXTRACTION_SYSTEM_PROMPT = """You are a highly specialized UK chartered accountant with extensive experience in auditing and analyzing the financial statements of football clubs in the English Football League (Championship, League One, League Two) and the National League. Your expertise is rooted in a deep understanding of FRS 102, UK GAAP, and the Companies Act 2006.
 
 **Core Expertise:**
 
@@ -376,13 +551,10 @@ async def extract_financial_metrics_with_gpt4(text: str) -> FinancialData:
     * TOTAL EQUITY
 
 **Your Task:**
-You will be provided with pre-cleaned text from a UK football club's financial statement. Your primary objective is to act as a meticulous financial data extractor. You will read and interpret the provided text to identify, extract, and structure key financial metrics according to the user's instructions."""
-        
-        # ENHANCED: User prompt with specific pattern handling
-        user_prompt = f"""**Objective:** From the provided pre-cleaned financial statement text, extract the key financial metrics for the specified accounting period.
+You will be provided with pre-cleaned text from a UK football club's financial statement. Your primary objective is to act as a meticulous financial data extractor. You will read and interpret the provided text to identify, extract, and structure key financial metrics according to the extraction rules below."""
 
-**CLEANED FINANCIAL TEXT:**
-{text}
+# ENHANCED: Extraction rules with specific pattern handling
+EXTRACTION_INSTRUCTIONS = """**Objective:** From the provided pre-cleaned financial statement text, extract the key financial metrics for the specified accounting period.
 
 **CRITICAL EXTRACTION RULES & FINANCIAL MAPPING:**
 
@@ -442,21 +614,14 @@ If main turnover extraction works, look for breakdown in notes:
 * If administrative_expenses > -1M, likely missed scale conversion
 * All monetary values should be consistent in scale
 
-**1. MANDATORY - DETERMINE ACCOUNT TYPE**
-**`is_abridged` (boolean)**: Set to `true` if you find **ANY** of these:
-* The phrase **"abridged accounts"** or **"abridged balance sheet"**
-* A reference to **"Section 444"** of the Companies Act 2006
-* **"small companies regime"**
-* **"The directors have chosen to not file a copy of the company's profit & loss account"**
-
-**2. CRITICAL - UK BALANCE SHEET EQUATION**
+**1. CRITICAL - UK BALANCE SHEET EQUATION**
 **Total Assets = Total Liabilities + Total Equity**
 
 1. **Extract Total Assets:** Fixed Assets + Current Assets (most common UK format)
 2. **Extract Total Equity:** From "Net assets" (positive) or "Net liabilities" (negative)
 3. **Calculate Total Liabilities:** Total Assets - Total Equity
 
-**3. P&L STATEMENT FIELDS:**
+**2. P&L STATEMENT FIELDS:**
 * **`turnover`**: "Turnover", "Revenue" from P&L header
 * **`operating_profit`**: "Operating profit" OR "Operating loss" (make losses negative)
 * **`net_income`**: "Profit/(loss) for the financial year" (preferred)
@@ -468,7 +633,7 @@ If main turnover extraction works, look for breakdown in notes:
 * **`interest_payable`**: "Interest payable"
 * **`other_operating_income`**: "Other operating income"
 
-**4. FOOTBALL-SPECIFIC EXTRACTIONS:**
+**3. FOOTBALL-SPECIFIC EXTRACTIONS:**
 * **`player_amortization`**: "Player amortisation", "Player amortisation and impairment" (negative)
 * **`profit_on_player_disposals`**: "Profit on disposal of registrations", "Profit on disposal of players"
 * **`matchday_revenue`**: "Gate receipts", "Match day income", "Season tickets"
@@ -478,7 +643,7 @@ If main turnover extraction works, look for breakdown in notes:
 * **`social_security_costs`**: "Social security costs"
 * **`pension_costs`**: "Pension costs"
 
-**5. BALANCE SHEET FIELDS:**
+**4. BALANCE SHEET FIELDS:**
 * **`intangible_assets`**: "Intangible assets" (usually player registrations)
 * **`tangible_assets`**: "Tangible assets"
 * **`current_assets`**: "Current assets"
@@ -487,163 +652,359 @@ If main turnover extraction works, look for breakdown in notes:
 * **`creditors_due_within_one_year`**: "Creditors: amounts falling due within one year" (negative)
 * **`creditors_due_after_one_year`**: "Creditors: amounts falling due after more than one year" (negative)
 
-**REQUIRED JSON FORMAT (NO OPERATING_EXPENSES):**
-{{
-    "is_abridged": boolean_or_null,
-    "turnover": number_or_null,
-    "operating_profit": number_or_null,
-    "net_income": number_or_null,
-    "profit_loss_before_tax": number_or_null,
-    "matchday_revenue": number_or_null,
-    "broadcasting_revenue": number_or_null,
-    "commercial_revenue": number_or_null,
-    "player_amortization": number_or_null,
-    "total_assets": number_or_null,
-    "net_assets": number_or_null,
-    "cash_at_bank": number_or_null,
-    "creditors_due_within_one_year": number_or_null,
-    "revenue": number_or_null,
-    "total_liabilities": number_or_null,
-    "total_equity": number_or_null,
-    "cash_and_cash_equivalents": number_or_null,
-    "creditors_due_after_one_year": number_or_null,
-    "other_staff_costs": number_or_null,
-    "stadium_costs": number_or_null,
-    "administrative_expenses": number_or_null,
-    "agent_fees": number_or_null,
-    "cost_of_sales": number_or_null,
-    "gross_profit": number_or_null,
-    "gross_loss": number_or_null,
-    "interest_receivable": number_or_null,
-    "interest_payable": number_or_null,
-    "other_operating_income": number_or_null,
-    "staff_costs_total": number_or_null,
-    "social_security_costs": number_or_null,
-    "pension_costs": number_or_null,
-    "depreciation_charges": number_or_null,
-    "operating_lease_charges": number_or_null,
-    "profit_on_player_disposals": number_or_null,
-    "loss_on_player_disposals": number_or_null,
-    "intangible_assets": number_or_null,
-    "tangible_assets": number_or_null,
-    "current_assets": number_or_null,
-    "stocks": number_or_null,
-    "debtors": number_or_null,
-    "operating_cash_flow": number_or_null,
-    "investing_cash_flow": number_or_null,
-    "financing_cash_flow": number_or_null
-}}"""
-        
-        # OPTIMIZED: GPT-4 call with enhanced prompts
-        response = client.chat.completions.create(
+**OUTPUT:** Return every field in the response schema, in full pounds, with null for anything not found. There is no operating_expenses field."""
+
+
+# Changes whenever the prompts do, so cached extractions from an older prompt are never reused
+EXTRACTION_SYSTEM_MESSAGE = EXTRACTION_SYSTEM_PROMPT + "\n\n" + EXTRACTION_INSTRUCTIONS
+EXTRACTION_TEXT_HEADER = "**CLEANED FINANCIAL TEXT:**\n"
+PROMPT_VERSION = hashlib.sha256((EXTRACTION_SYSTEM_MESSAGE + EXTRACTION_TEXT_HEADER).encode()).hexdigest()[:12]
+
+
+def build_extraction_messages(text: str) -> List[Dict[str, str]]:
+    """
+    Build the system/user chat messages for GPT-4 financial extraction
+    """
+    return [
+        {"role": "system", "content": EXTRACTION_SYSTEM_MESSAGE},
+        {"role": "user", "content": EXTRACTION_TEXT_HEADER + text}
+    ]
+
+
+def _load_token_encoding():
+    """
+    gpt-4.1 tokenizer, or None when its BPE file can't be loaded. The Docker image warms
+    TIKTOKEN_CACHE_DIR at build time, so this reads a local file rather than downloading.
+    """
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("Token encoding unavailable, truncating by characters: %s", e)
+        return None
+
+
+# Loaded once at import - a missing BPE file is not retried on every request
+_TOKEN_ENCODING = _load_token_encoding()
+
+
+def _truncate_tokens_sync(text: str, max_tokens: int) -> str:
+    tokens = _TOKEN_ENCODING.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    
+    logger.info("Truncating extraction input from %d to %d tokens", len(tokens), max_tokens)
+    return _TOKEN_ENCODING.decode(tokens[:max_tokens])
+
+
+async def truncate_to_tokens(text: str, max_tokens: int = MAX_INPUT_TOKENS) -> str:
+    """
+    Cut text to at most max_tokens GPT-4 tokens
+    """
+    # A token covers at least one character, so shorter text always fits
+    if len(text) <= max_tokens:
+        return text
+    
+    if _TOKEN_ENCODING is None:
+        return text[:max_tokens * 4]  # ~4 characters per token in English text
+    
+    # Encoding a long annual report takes tens of milliseconds - keep it off the event loop
+    return await asyncio.to_thread(_truncate_tokens_sync, text, max_tokens)
+
+
+def build_batched_extraction_messages(texts: List[str]) -> List[Dict[str, str]]:
+    """
+    Build chat messages that extract several short documents in one GPT-4 call
+    """
+    records = "\n\n".join(f"<<<record_{i}>>>\n{text}" for i, text in enumerate(texts))
+    messages = build_extraction_messages(records)
+    
+    messages[1]["content"] += f"""
+
+**MULTIPLE DOCUMENTS:**
+The cleaned text above contains {len(texts)} separate financial statements, each starting with a <<<record_N>>> marker. Extract each one independently - never carry figures from one record into another. Return a single JSON object keyed by record number ("0" to "{len(texts) - 1}"), where each value holds that record's fields."""
+    
+    return messages
+
+
+def parse_financial_response(result_text: str, document_info: Dict[str, Any]) -> FinancialData:
+    """
+    Parse a GPT-4 JSON response and build a validated FinancialData object
+    """
+    return build_financial_data(orjson.loads(result_text), document_info)
+
+
+def build_financial_data(financial_dict: Dict[str, Any], document_info: Dict[str, Any]) -> FinancialData:
+    """
+    Validate one record's extracted values and build a FinancialData object
+    """
+    logger.debug("Before validation: turnover=%s administrative_expenses=%s player_amortization=%s",
+                 financial_dict.get('turnover'),
+                 financial_dict.get('administrative_expenses'),
+                 financial_dict.get('player_amortization'))
+    
+    # Validate extracted values make business sense
+    validated_dict = validate_financial_data(financial_dict)
+    
+    logger.debug("After validation: turnover=%s administrative_expenses=%s player_amortization=%s",
+                 validated_dict.get('turnover'),
+                 validated_dict.get('administrative_expenses'),
+                 validated_dict.get('player_amortization'))
+    
+    # Create FinancialData object with validated values (NO operating_expenses).
+    # validate_financial_data already coerced every value to float or None, so the
+    # pydantic field validation would only repeat that work
+    result = FinancialData.model_construct(
+        # Document metadata from detection
+        is_abridged=document_info["is_abridged"],
+        document_type=document_info["document_type"],
+        profit_loss_filed=document_info["profit_loss_filed"],
+        # Financial data from extraction
+        **{field: validated_dict.get(field) for field in EXTRACTED_FIELDS}
+    )
+    
+    # Log successful extraction summary with document context
+    if logger.isEnabledFor(logging.INFO):
+        extracted_fields = [k for k, v in validated_dict.items() if v is not None]
+        logger.info("Enhanced financial extraction successful: %d fields %s abridged=%s type=%s p&l_filed=%s",
+                    len(extracted_fields), extracted_fields[:5], document_info["is_abridged"],
+                    document_info["document_type"], document_info["profit_loss_filed"])
+    
+    return result
+
+
+def _extraction_cache_key(text: str) -> str:
+    """Redis key for a document's extraction under the current deployment and prompt"""
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    return f"financial_extraction:{DEPLOYMENT}:{PROMPT_VERSION}:{digest}"
+
+
+def _remember_extraction(key: str, financial_data: FinancialData):
+    """Keep an extraction in this worker's LRU, evicting the least recently used"""
+    _EXTRACTION_MEMORY_CACHE[key] = financial_data
+    _EXTRACTION_MEMORY_CACHE.move_to_end(key)
+    if len(_EXTRACTION_MEMORY_CACHE) > EXTRACTION_MEMORY_CACHE_SIZE:
+        _EXTRACTION_MEMORY_CACHE.popitem(last=False)
+
+
+async def get_cached_extraction(text: str) -> Optional[FinancialData]:
+    """
+    Previously extracted FinancialData for exactly this text, if any.
+    Re-indexing and reprocessing runs resend identical cleaned text.
+    Callers get a copy, never the cached object.
+    """
+    key = _extraction_cache_key(text)
+    
+    financial_data = _EXTRACTION_MEMORY_CACHE.get(key)
+    if financial_data is not None:
+        _EXTRACTION_MEMORY_CACHE.move_to_end(key)
+        return financial_data.model_copy()
+    
+    # The Redis client is synchronous - keep its round trip (or connect timeout) off the event loop
+    cached = await asyncio.to_thread(cache_service.get, key)
+    if not cached:
+        return None
+    
+    financial_data = FinancialData.model_validate(cached)
+    _remember_extraction(key, financial_data)
+    return financial_data.model_copy()
+
+
+async def store_extraction(text: str, financial_data: FinancialData):
+    """Cache a successful extraction - results with no extracted figures are not kept"""
+    if any(getattr(financial_data, field) is not None for field in EXTRACTED_FIELDS):
+        key = _extraction_cache_key(text)
+        _remember_extraction(key, financial_data.model_copy())
+        await asyncio.to_thread(cache_service.set, key, financial_data.model_dump(exclude_none=True), ttl=EXTRACTION_CACHE_TTL)
+
+
+async def _stream_completion(messages: List[Dict[str, str]], **overrides):
+    """
+    Stream a GPT-4 chat completion and return (content, usage).
+    Content after the top-level JSON object closes is ignored, but the stream is read on
+    until the usage chunk that include_usage sends last.
+    `overrides` replace entries of EXTRACTION_PARAMS for this call.
+    Every GPT-4 call goes through here, so this is where EXTRACTION_CONCURRENCY is enforced.
+    """
+    parts = []
+    usage = None
+    depth = 0
+    closed = False
+    
+    async with _EXTRACTION_SEMAPHORE, asyncio.timeout(EXTRACTION_TIMEOUT):
+        stream = await _AOAI_CLIENT.chat.completions.create(
             model=DEPLOYMENT,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.01,  # Extremely low for maximum consistency
-            max_tokens=2500,   # Increased for comprehensive response
-            response_format={"type": "json_object"}
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **{**EXTRACTION_PARAMS, **overrides}
         )
         
-        result_text = response.choices[0].message.content
-        print(f"GPT-4 raw response: {result_text}")
-        logger.info(f"GPT-4 raw response: {result_text}") 
-        logger.info("GPT-4 extraction completed", 
-                   response_length=len(result_text),
-                   estimated_cost_tokens=response.usage.total_tokens if hasattr(response, 'usage') else 'unknown')
+        async for chunk in stream:
+            # Azure sends content-filter chunks with no choices; usage arrives on the final chunk
+            if not closed and chunk.choices and chunk.choices[0].delta.content:
+                content = chunk.choices[0].delta.content
+                # The schema only allows numbers and null as values, so braces never appear in strings
+                for end, char in enumerate(content, 1):
+                    if char == "{":
+                        depth += 1
+                    elif char == "}":
+                        depth -= 1
+                        if depth == 0:
+                            content = content[:end]
+                            closed = True
+                            break
+                parts.append(content)
+            if chunk.usage:
+                usage = chunk.usage
+    
+    return "".join(parts), usage
+
+
+async def extract_financial_metrics_with_gpt4(text: str) -> FinancialData:
+    """
+    ENHANCED: GPT-4 extraction optimized for specific cleaned text patterns
+    Enhanced with comprehensive UK football accounting expertise
+    """
+    
+    if _AOAI_CLIENT is None:
+        logger.error("Azure AI API key not configured")
+        raise HTTPException(status_code=500, detail="Azure AI API key not configured")
+    
+    # SIMPLIFIED: Basic validation only
+    if not text or len(text.strip()) < 10:
+        logger.warning("Insufficient text for extraction: %d characters", len(text) if text else 0)
+        return EMPTY_FINANCIAL_DATA.model_copy()
+    
+    cached = await get_cached_extraction(text)
+    if cached is not None:
+        logger.info("Using cached financial extraction for %d characters", len(text))
+        return cached
+    
+    try:
+        # STEP 1: Detect document type before extraction
+        document_info = detect_abridged_accounts(text)
+        
+        logger.info("Starting financial extraction: %d characters abridged=%s type=%s p&l_filed=%s",
+                    len(text), document_info["is_abridged"],
+                    document_info["document_type"], document_info["profit_loss_filed"])
+        
+        result_text, usage = await _stream_completion(build_extraction_messages(await truncate_to_tokens(text)))
+        logger.debug("GPT-4 raw response: %s", result_text)
+        logger.info("GPT-4 extraction completed: %d characters, %s tokens",
+                    len(result_text), usage.total_tokens if usage else 'unknown')
         
         # Parse and validate JSON response
         try:
-            financial_dict = json.loads(result_text)
+            financial_data = parse_financial_response(result_text, document_info)
+            await store_extraction(text, financial_data)
+            return financial_data
             
-            print(f"DEBUG - Before validation: turnover = {financial_dict.get('turnover')}")
-            print(f"DEBUG - Before validation: administrative_expenses = {financial_dict.get('administrative_expenses')}")
-            print(f"DEBUG - Before validation: player_amortization = {financial_dict.get('player_amortization')}")
+        except orjson.JSONDecodeError as e:
+            logger.error("JSON parsing failed: %s (response starts %r)", e, result_text[:200])
+            return EMPTY_FINANCIAL_DATA.model_copy()
             
-            # Validate extracted values make business sense
-            validated_dict = validate_financial_data(financial_dict)
+    except TRANSIENT_EXTRACTION_ERRORS as e:
+        logger.error("Financial extraction failed after retries: %s: %s", type(e).__name__, e)
+        raise
+    
+    except Exception as e:
+        logger.error("Financial extraction failed: %s: %s", type(e).__name__, e)
+        return EMPTY_FINANCIAL_DATA.model_copy()
+
+
+async def extract_financial_metrics_batch(texts: List[str]) -> List[Optional[FinancialData]]:
+    """
+    Extract several short documents with one GPT-4 call, returned in input order.
+    Records missing from the combined response are retried individually; a record
+    whose retry fails too comes back as None so the rest of the batch is kept.
+    """
+    
+    if _AOAI_CLIENT is None:
+        logger.error("Azure AI API key not configured")
+        raise HTTPException(status_code=500, detail="Azure AI API key not configured")
+    
+    results: List[Optional[FinancialData]] = list(await asyncio.gather(*[get_cached_extraction(text) for text in texts]))
+    pending = [i for i, data in enumerate(results) if data is None]
+    
+    # A single uncached record is cheaper through the per-record retry below
+    if len(pending) > 1:
+        try:
+            pending_texts = [texts[i] for i in pending]
+            document_infos = [detect_abridged_accounts(text) for text in pending_texts]
             
-            print(f"DEBUG - After validation: turnover = {validated_dict.get('turnover')}")
-            print(f"DEBUG - After validation: administrative_expenses = {validated_dict.get('administrative_expenses')}")
-            print(f"DEBUG - After validation: player_amortization = {validated_dict.get('player_amortization')}")
+            logger.info("Starting batched financial extraction: %d records, %d characters",
+                        len(pending_texts), sum(map(len, pending_texts)))
             
-            # Create FinancialData object with validated values (NO operating_expenses)
-            result = FinancialData(
-                # Document metadata from detection
-                is_abridged=document_info["is_abridged"],
-                document_type=document_info["document_type"],
-                profit_loss_filed=document_info["profit_loss_filed"],
-                # Financial data from extraction
-                revenue=validated_dict.get('revenue'),
-                turnover=validated_dict.get('turnover'),
-                # operating_expenses=validated_dict.get('operating_expenses'),  # REMOVED
-                total_equity=validated_dict.get('total_equity'),               
-                net_income=validated_dict.get('net_income'),                  
-                total_assets=validated_dict.get('total_assets'),
-                total_liabilities=validated_dict.get('total_liabilities'),
-                net_assets=validated_dict.get('net_assets'),
-                cash_at_bank=validated_dict.get('cash_at_bank'),
-                cash_and_cash_equivalents=validated_dict.get('cash_and_cash_equivalents'),
-                creditors_due_within_one_year=validated_dict.get('creditors_due_within_one_year'),
-                creditors_due_after_one_year=validated_dict.get('creditors_due_after_one_year'),
-                operating_profit=validated_dict.get('operating_profit'),
-                profit_loss_before_tax=validated_dict.get('profit_loss_before_tax'),
-                broadcasting_revenue=validated_dict.get('broadcasting_revenue'),
-                commercial_revenue=validated_dict.get('commercial_revenue'),
-                matchday_revenue=validated_dict.get('matchday_revenue'),
-                player_trading_income=validated_dict.get('player_trading_income'),
-                player_wages=validated_dict.get('player_wages'),
-                player_amortization=validated_dict.get('player_amortization'),
-                other_staff_costs=validated_dict.get('other_staff_costs'),
-                stadium_costs=validated_dict.get('stadium_costs'),
-                administrative_expenses=validated_dict.get('administrative_expenses'),
-                agent_fees=validated_dict.get('agent_fees'),
-                cost_of_sales=validated_dict.get('cost_of_sales'),
-                gross_profit=validated_dict.get('gross_profit'),
-                gross_loss=validated_dict.get('gross_loss'),
-                interest_receivable=validated_dict.get('interest_receivable'),
-                interest_payable=validated_dict.get('interest_payable'),
-                other_operating_income=validated_dict.get('other_operating_income'),
-                staff_costs_total=validated_dict.get('staff_costs_total'),
-                social_security_costs=validated_dict.get('social_security_costs'),
-                pension_costs=validated_dict.get('pension_costs'),
-                depreciation_charges=validated_dict.get('depreciation_charges'),
-                operating_lease_charges=validated_dict.get('operating_lease_charges'),
-                profit_on_player_disposals=validated_dict.get('profit_on_player_disposals'),
-                loss_on_player_disposals=validated_dict.get('loss_on_player_disposals'),
-                intangible_assets=validated_dict.get('intangible_assets'),
-                tangible_assets=validated_dict.get('tangible_assets'),
-                current_assets=validated_dict.get('current_assets'),
-                stocks=validated_dict.get('stocks'),
-                debtors=validated_dict.get('debtors'),
-                operating_cash_flow=validated_dict.get('operating_cash_flow'),
-                investing_cash_flow=validated_dict.get('investing_cash_flow'),
-                financing_cash_flow=validated_dict.get('financing_cash_flow'),
+            result_text, usage = await _stream_completion(
+                build_batched_extraction_messages(pending_texts),
+                max_tokens=EXTRACTION_PARAMS["max_tokens"] * len(pending_texts),
+                response_format=extraction_response_format(len(pending_texts))
             )
+            logger.info("GPT-4 batched extraction completed: %d characters, %s tokens",
+                        len(result_text), usage.total_tokens if usage else 'unknown')
             
-            print(f"DEBUG - Final result: turnover = {result.turnover}")
-            print(f"DEBUG - Final result: administrative_expenses = {result.administrative_expenses}")
-            print(f"DEBUG - Final result: player_amortization = {result.player_amortization}")
-            
-            # Log successful extraction summary with document context
-            extracted_fields = [k for k, v in validated_dict.items() if v is not None]
-            logger.info("Enhanced financial extraction successful",
-                       fields_extracted=len(extracted_fields),
-                       extracted_fields=extracted_fields[:5],
-                       is_abridged=document_info["is_abridged"],
-                       document_type=document_info["document_type"],
-                       profit_loss_filed=document_info["profit_loss_filed"])
-            
-            return result
-            
-        except json.JSONDecodeError as e:
-            logger.error("JSON parsing failed", error=str(e), response_preview=result_text[:200])
-            return FinancialData()
-            
-    except Exception as e:
-        logger.error("Financial extraction failed", error=str(e), error_type=type(e).__name__)
-        return FinancialData()
+            payload = orjson.loads(result_text)
+            for position, (i, document_info) in enumerate(zip(pending, document_infos)):
+                record = payload.get(str(position))
+                if isinstance(record, dict):
+                    results[i] = build_financial_data(record, document_info)
+                    await store_extraction(texts[i], results[i])
+                    
+        except Exception as e:
+            logger.error("Batched financial extraction failed: %s: %s", type(e).__name__, e)
+    
+    missing = [i for i, data in enumerate(results) if data is None]
+    if missing:
+        logger.warning("Retrying %d of %d batched records individually", len(missing), len(texts))
+        retried = await asyncio.gather(
+            *[extract_financial_metrics_with_gpt4(texts[i]) for i in missing],
+            return_exceptions=True
+        )
+        for i, data in zip(missing, retried):
+            if isinstance(data, BaseException):
+                logger.error("Individual retry failed for batched record %d: %s: %s", i, type(data).__name__, data)
+                continue
+            results[i] = data
+    
+    return results
+
+
+# (indicator, document_type) pairs that mark a filing as abridged or micro entity,
+# in priority order. The title indicator comes first as it appears in every abridged filing.
+# Longer variants of a later indicator are omitted - "abridged accounts" already covers
+# "preparation of abridged accounts" and "section 444" covers "section 444(2a)".
+DOCUMENT_TYPE_INDICATORS = (
+    ("unaudited abridged accounts", "abridged"),
+    ("abridged accounts", "abridged"),
+    ("abridged financial statements", "abridged"),
+    ("section 444", "abridged"),
+    ("small companies regime", "abridged"),
+    # Micro entity accounts (even more limited than abridged)
+    ("micro-entity", "micro"),
+    ("micro entity", "micro"),
+    ("section 384a", "micro"),
+    ("section 384b", "micro"),
+)
+
+# Exemption wording in full accounts - each match adds a "small_company" exemption
+SMALL_COMPANY_INDICATORS = (
+    "section 477",
+    "small companies",
+    "small company exemption",
+    "audit exemption",
+)
+
+# Any of these means the Profit & Loss Account was filed with the full accounts
+PROFIT_LOSS_PRESENT_INDICATORS = (
+    "profit and loss account",
+    "statement of comprehensive income",
+    "income statement",
+    "turnover",
+)
+
+# Every DOCUMENT_TYPE_INDICATORS entry contains one of these, so a text with none of them cannot
+# be abridged or micro. Full accounts (the common case) never contain them.
+DOCUMENT_TYPE_ANCHORS = ("abridged", "micro", "section 444", "section 384", "small companies regime")
 
 
 def detect_abridged_accounts(text: str) -> Dict[str, Any]:
@@ -661,75 +1022,23 @@ def detect_abridged_accounts(text: str) -> Dict[str, Any]:
         "filing_exemptions": []
     }
     
-    # PRIMARY DETECTION: Look for "unaudited abridged accounts" in title
-    # This is the most reliable indicator as it appears in every abridged filing
-    if "unaudited abridged accounts" in text_lower:
-        detection_result["is_abridged"] = True
-        detection_result["document_type"] = "abridged"
-        detection_result["profit_loss_filed"] = False  # Abridged accounts don't include P&L
-        logger.info("Detected abridged accounts from title", 
-                   indicator="unaudited abridged accounts")
-        return detection_result
-    
-    # SECONDARY DETECTION: Other abridged indicators as fallback
-    abridged_indicators = [
-        "abridged accounts",
-        "abridged financial statements", 
-        "preparation of abridged accounts",
-        "section 444",
-        "section 444(2a)",
-        "section 444 (2a)",  # With spaces
-        "small companies regime"
-    ]
-    
-    # Check for other abridged account indicators
-    for indicator in abridged_indicators:
-        if indicator in text_lower:
-            detection_result["is_abridged"] = True
-            detection_result["document_type"] = "abridged"
-            detection_result["profit_loss_filed"] = False
-            logger.info("Detected abridged accounts from indicator", 
-                       indicator=indicator)
-            return detection_result
-    
-    # Check for micro entity accounts (even more limited than abridged)
-    micro_indicators = [
-        "micro-entity",
-        "micro entity",
-        "section 384a",
-        "section 384b"
-    ]
-    
-    for indicator in micro_indicators:
-        if indicator in text_lower:
-            detection_result["is_abridged"] = True
-            detection_result["document_type"] = "micro"
-            detection_result["profit_loss_filed"] = False
-            logger.info("Detected micro entity accounts", 
-                       indicator=indicator)
-            return detection_result
+    # Abridged and micro entity filings, checked in priority order over the single lowered copy
+    if any(anchor in text_lower for anchor in DOCUMENT_TYPE_ANCHORS):
+        for indicator, document_type in DOCUMENT_TYPE_INDICATORS:
+            if indicator in text_lower:
+                detection_result["is_abridged"] = True
+                detection_result["document_type"] = document_type
+                detection_result["profit_loss_filed"] = False  # Abridged/micro accounts don't include P&L
+                logger.info("Detected %s accounts from indicator: %s", document_type, indicator)
+                return detection_result
     
     # If not abridged, check for full accounts with exemptions
-    small_company_indicators = [
-        "section 477",
-        "small companies",
-        "small company exemption",
-        "audit exemption"
-    ]
-    
-    for indicator in small_company_indicators:
+    for indicator in SMALL_COMPANY_INDICATORS:
         if indicator in text_lower:
             detection_result["filing_exemptions"].append("small_company")
     
     # Check if Profit & Loss Account appears to be present (for full accounts)
-    profit_loss_present_indicators = [
-        "profit and loss account",
-        "statement of comprehensive income",
-        "income statement",
-        "turnover"
-    ]
-    
-    profit_loss_present = any(indicator in text_lower for indicator in profit_loss_present_indicators)
+    profit_loss_present = any(indicator in text_lower for indicator in PROFIT_LOSS_PRESENT_INDICATORS)
     
     # Determine final classification for non-abridged accounts
     if profit_loss_present:
@@ -739,15 +1048,27 @@ def detect_abridged_accounts(text: str) -> Dict[str, Any]:
         detection_result["document_type"] = "unknown"
         detection_result["profit_loss_filed"] = None
     
-    logger.info("Document type detection completed",
-               is_abridged=detection_result["is_abridged"],
-               document_type=detection_result["document_type"],
-               profit_loss_filed=detection_result["profit_loss_filed"],
-               exemptions=detection_result["filing_exemptions"])
+    logger.info("Document type detection completed: type=%s p&l_filed=%s exemptions=%s",
+                detection_result["document_type"], detection_result["profit_loss_filed"],
+                detection_result["filing_exemptions"])
     
     return detection_result
 
 
+# Per-field validation rules: (force negative, £'000 scale check, (too low, too high) bounds).
+# Expenses and liabilities are always negative in UK accounts; turnover, total assets and
+# admin expenses should be in the millions for Championship clubs (turnover 8M-150M).
+FIELD_RULES = {
+    'turnover': (False, True, (1000000, 500000000)),
+    'total_assets': (False, True, None),
+    'administrative_expenses': (True, True, None),
+    'player_amortization': (True, False, None),
+    'cost_of_sales': (True, False, None),
+    'creditors_due_within_one_year': (True, False, None),
+    'creditors_due_after_one_year': (True, False, None),
+}
+
+
 def validate_financial_data(financial_dict: Dict[str, Any]) -> Dict[str, Any]:
     """
     ENHANCED: Validate extracted financial data for business logic consistency
@@ -755,62 +1076,39 @@ def validate_financial_data(financial_dict: Dict[str, Any]) -> Dict[str, Any]:
     """
     validated = {}
     
+    # Coerce every value to float, then apply its rule with a single table lookup
     for key, value in financial_dict.items():
         if value is None:
             validated[key] = None
             continue
-            
-        # Convert to float and validate
+        
         try:
-            numeric_value = float(value) if value != 0 else 0.0
-            
-            # ENHANCED: Specific validation for your data patterns
-            if key == 'turnover':
-                # Championship clubs should have turnover 8M-150M
-                if numeric_value > 0 and numeric_value < 1000000:  # Less than 1M
-                    logger.warning(f"Turnover seems too low: {numeric_value:,} - possible scale issue")
-                elif numeric_value > 500000000:  # More than 500M
-                    logger.warning(f"Turnover seems too high: {numeric_value:,} - possible scale issue")
-                    
-            elif key == 'administrative_expenses':
-                # Should be negative for expenses
-                if numeric_value > 0:
-                    logger.warning(f"Administrative expenses should be negative: {numeric_value:,}")
-                    numeric_value = -abs(numeric_value)  # Force negative
-                    
-            elif key == 'player_amortization':
-                # Should be negative (expense)
-                if numeric_value > 0:
-                    logger.warning(f"Player amortization should be negative: {numeric_value:,}")
-                    numeric_value = -abs(numeric_value)  # Force negative
-                    
-            elif key == 'cost_of_sales':
-                # Should be negative (expense)
-                if numeric_value > 0:
-                    logger.warning(f"Cost of sales should be negative: {numeric_value:,}")
-                    numeric_value = -abs(numeric_value)  # Force negative
-                    
-            elif key in ['creditors_due_within_one_year', 'creditors_due_after_one_year']:
-                # Should be negative (liabilities)
-                if numeric_value > 0:
-                    logger.warning(f"{key} should be negative: {numeric_value:,}")
-                    numeric_value = -abs(numeric_value)  # Force negative
-                    
-            elif key == 'operating_profit':
-                # Can be positive or negative - no change needed
-                pass
-                
-            # ENHANCED: Scale consistency check
-            if key in ['turnover', 'total_assets', 'administrative_expenses'] and abs(numeric_value) > 1000:
-                # These should be substantial amounts for Championship clubs
-                if abs(numeric_value) < 1000000:  # Less than 1M
-                    logger.info(f"{key} scale check: {numeric_value:,} - may need £'000 conversion")
-                    
-            validated[key] = numeric_value
-            
+            numeric_value = float(value)
         except (ValueError, TypeError):
-            logger.warning(f"Could not convert {key} value to number: {value}")
+            logger.warning("Could not convert %s value to number: %s", key, value)
             validated[key] = None
+            continue
+        
+        rule = FIELD_RULES.get(key)
+        if rule is not None:
+            force_negative, scale_check, bounds = rule
+            
+            if force_negative and numeric_value > 0:
+                logger.warning("%s should be negative: %s", key, numeric_value)
+                numeric_value = -numeric_value
+            
+            if bounds is not None:
+                too_low, too_high = bounds
+                if 0 < numeric_value < too_low:
+                    logger.warning("%s seems too low: %s - possible scale issue", key, numeric_value)
+                elif numeric_value > too_high:
+                    logger.warning("%s seems too high: %s - possible scale issue", key, numeric_value)
+            
+            # ENHANCED: Scale consistency check
+            if scale_check and 1000 < abs(numeric_value) < 1000000:
+                logger.info("%s scale check: %s - may need £'000 conversion", key, numeric_value)
+        
+        validated[key] = numeric_value
     
     # ENHANCED: Cross-field validation for your specific patterns
     # Sheffield United pattern validation
@@ -822,118 +1120,340 @@ def validate_financial_data(financial_dict: Dict[str, Any]) -> Dict[str, Any]:
         logger.info("Detected Sheffield United pattern validation")
         
         if admin_exp and abs(admin_exp) < 10000000:  # Less than 10M
-            logger.warning(f"Admin expenses seem low for Sheffield United pattern: {admin_exp:,}")
+            logger.warning("Admin expenses seem low for Sheffield United pattern: %s", admin_exp)
             
         if player_amort and abs(player_amort) < 5000000:  # Less than 5M
-            logger.warning(f"Player amortization seems low: {player_amort:,}")
+            logger.warning("Player amortization seems low: %s", player_amort)
     
     return validated
 
 
-@router.post("/extract-financials", response_model=SkillResponse)
-async def extract_financials(request: SkillRequest):
+def _is_mostly_whitespace(text: str) -> bool:
     """
-    ENHANCED: Azure Search Custom Web API Skill endpoint with improved extraction
+    True when text is mostly line breaks or has under 100 characters once stripped
     """
-    print(f"DEBUG - Received enhanced extract-financials request with {len(request.values)} values")
-    
-    if not API_KEY:
+    if len(text) < 100 or text.count('\n') > len(text) * 0.8:
+        return True
+    # Only padded text needs the stripped copy to measure its length
+    if not (text[0].isspace() or text[-1].isspace()):
+        return False
+    return len(text.strip()) < 100
+
+
+async def require_api_key():
+    """Route dependency - reject extraction requests when no Azure AI client is configured"""
+    if _AOAI_CLIENT is None:
         raise HTTPException(status_code=500, detail="Azure AI API key not configured")
+
+
+def _record_text(i: int, value: RecordValue) -> Tuple[str, Optional[str]]:
+    """
+    Pull the cleaned text for a skill record, returning (text, error message)
+    """
+    record_id = value.recordId
+    logger.debug("Processing record %d: %s", i, record_id)
     
-    results = []
+    # Handle both text_sections array and simple text
+    text_content = ""
     
-    for i, value in enumerate(request.values):
-        record_id = value.recordId
-        print(f"DEBUG - Processing record {i}: {record_id}")
+    if value.data.text_sections:
+        logger.debug("Found %d text sections", len(value.data.text_sections))
+        text_content = extract_text_from_sections(value.data.text_sections, value.data.pre_cleaned)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Combined into %d characters: %s...", len(text_content), text_content[:200])
         
-        # Handle both text_sections array and simple text
-        text_content = ""
+    elif value.data.text:
+        logger.debug("Found simple text: %d characters", len(value.data.text))
+        text_content = value.data.text
         
+    else:
+        logger.debug("No text content found for %s", record_id)
+        return "", "No text content provided"
+    
+    # ENHANCED: Better whitespace detection and fallback
+    if text_content and _is_mostly_whitespace(text_content):
+        logger.debug("Content appears to be mostly whitespace, trying fallback")
         if value.data.text_sections:
-            print(f"DEBUG - Found {len(value.data.text_sections)} text sections")
-            text_content = extract_text_from_sections(value.data.text_sections)
-            print(f"DEBUG - Combined into {len(text_content)} characters")
-            print(f"DEBUG - Text preview: {text_content[:200]}...")
-            
-        elif value.data.text:
-            print(f"DEBUG - Found simple text: {len(value.data.text)} characters")
-            text_content = value.data.text
-            
-        else:
-            print(f"DEBUG - No text content found for {record_id}")
-            results.append(RecordResult(
-                recordId=record_id,
-                data=FinancialData(),
-                errors=[RecordError(message="No text content provided")]
-            ))
+            text_content = extract_text_from_sections(value.data.text_sections, value.data.pre_cleaned)
+            logger.debug("Fallback extracted %d characters", len(text_content))
+    
+    if not text_content or text_content.isspace():
+        logger.debug("Empty text content for %s", record_id)
+        return "", "Empty text content"
+    
+    return text_content, None
+
+
+def _group_records(pending: List[Tuple[int, str]]) -> List[List[Tuple[int, str]]]:
+    """
+    Pack short records into shared GPT-4 calls - long records get a call each
+    """
+    groups = []
+    current: List[Tuple[int, str]] = []
+    current_chars = 0
+    
+    for i, text in pending:
+        # Near-empty texts go alone too so the single-record path can skip the call
+        if len(text) > BATCHED_RECORD_MAX_CHARS or len(text.strip()) < 10:
+            groups.append([(i, text)])
             continue
+        if current and (current_chars + len(text) > BATCHED_PROMPT_CHAR_LIMIT
+                        or len(current) == BATCHED_MAX_RECORDS):
+            groups.append(current)
+            current, current_chars = [], 0
+        current.append((i, text))
+        current_chars += len(text)
+    
+    if current:
+        groups.append(current)
+    
+    return groups
+
+
+async def _extract_group(group: List[Tuple[int, str]], values: List[RecordValue]) -> List[RecordResult]:
+    """
+    Extract financial data for a group of skill records, in group order
+    """
+    record_ids = [values[i].recordId for i, _ in group]
+    texts = [text for _, text in group]
+    
+    try:
+        logger.debug("Starting extraction for %s", record_ids)
+        if len(texts) == 1:
+            extracted = [await extract_financial_metrics_with_gpt4(texts[0])]
+        else:
+            extracted = await extract_financial_metrics_batch(texts)
         
-        # ENHANCED: Better whitespace detection and fallback
-        if text_content and (text_content.count('\n') > len(text_content) * 0.8 or len(text_content.strip()) < 100):
-            print(f"DEBUG - Content appears to be mostly whitespace, trying fallback")
-            if value.data.text_sections:
-                print(f"DEBUG - Attempting enhanced fallback extraction")
-                text_content = extract_text_from_sections(value.data.text_sections)
-                print(f"DEBUG - Fallback extracted {len(text_content)} characters")
-        
-        if not text_content.strip():
-            print(f"DEBUG - Empty text content for {record_id}")
+    except Exception as e:
+        logger.warning("Error extracting for %s: %s", record_ids, e)
+        return [
+            RecordResult(
+                recordId=record_id,
+                data=EMPTY_FINANCIAL_DATA,
+                errors=[RecordError(message=f"Extraction failed: {str(e)}")]
+            )
+            for record_id in record_ids
+        ]
+    
+    results = []
+    for record_id, financial_data in zip(record_ids, extracted):
+        # The batch path leaves None for a record whose individual retry failed
+        if financial_data is None:
             results.append(RecordResult(
                 recordId=record_id,
-                data=FinancialData(),
-                errors=[RecordError(message="Empty text content")]
+                data=EMPTY_FINANCIAL_DATA,
+                errors=[RecordError(message="Extraction failed: record could not be extracted")]
             ))
             continue
-        
-        try:
-            print(f"DEBUG - Starting enhanced extraction for {record_id}")
-            financial_data = await extract_financial_metrics_with_gpt4(text_content)
-            
+        logger.debug("Extracted %s: turnover=%s admin_exp=%s", record_id,
+                     financial_data.turnover, financial_data.administrative_expenses)
+        results.append(RecordResult(recordId=record_id, data=financial_data))
+    
+    return results
+
+
+@router.post("/extract-financials", response_model=SkillResponse, response_model_exclude_none=True,
+             dependencies=[Depends(require_api_key)])
+async def extract_financials(request: SkillRequest):
+    """
+    ENHANCED: Azure Search Custom Web API Skill endpoint with improved extraction
+    """
+    logger.debug("Received extract-financials request with %d values", len(request.values))
+    
+    results: List[Optional[RecordResult]] = []
+    pending = []
+    
+    for i, value in enumerate(request.values):
+        text_content, error = _record_text(i, value)
+        if error:
             results.append(RecordResult(
-                recordId=record_id,
-                data=financial_data
+                recordId=value.recordId,
+                data=EMPTY_FINANCIAL_DATA,
+                errors=[RecordError(message=error)]
             ))
-            
-            print(f"DEBUG - Successfully extracted for {record_id}")
-            print(f"DEBUG - Key fields: turnover={financial_data.turnover}, admin_exp={financial_data.administrative_expenses}")
-            
-        except Exception as e:
-            print(f"DEBUG - Error extracting for {record_id}: {e}")
+        elif not has_financial_content(text_content):
+            logger.info("Skipping extraction for %s: no financial statement content", value.recordId)
             results.append(RecordResult(
-                recordId=record_id,
-                data=FinancialData(),
-                errors=[RecordError(message=f"Extraction failed: {str(e)}")]
+                recordId=value.recordId,
+                data=EMPTY_FINANCIAL_DATA,
+                warnings=[RecordWarning(message="Skipped: no financial statement content")]
             ))
+        else:
+            results.append(None)
+            pending.append((i, text_content))
+    
+    groups = _group_records(pending)
+    group_results = await asyncio.gather(*[_extract_group(group, request.values) for group in groups])
     
-    print(f"DEBUG - Returning {len(results)} enhanced results")
+    # Put each group's results back at their records' positions
+    for group, records in zip(groups, group_results):
+        for (i, _), record in zip(group, records):
+            results[i] = record
+    
+    logger.debug("Returning %d results", len(results))
     return SkillResponse(values=results)
 
 
-@router.post("/test-extraction")
+@router.post("/test-extraction", response_model=FinancialData, response_model_exclude_none=True,
+             dependencies=[Depends(require_api_key)])
 async def test_extraction(request: InputData):
     """ENHANCED: Test endpoint for development with better debugging"""
     
-    if not API_KEY:
-        raise HTTPException(status_code=500, detail="Azure AI API key not configured")
-    
     # Handle both formats in test endpoint too
     if request.text_sections:
-        text_content = extract_text_from_sections(request.text_sections)
-        print(f"DEBUG - Test: Combined {len(request.text_sections)} sections into {len(text_content)} characters")
+        text_content = extract_text_from_sections(request.text_sections, request.pre_cleaned)
+        logger.debug("Test: combined %d sections into %d characters", len(request.text_sections), len(text_content))
     elif request.text:
         text_content = request.text
-        print(f"DEBUG - Test: Using {len(text_content)} characters of text")
+        logger.debug("Test: using %d characters of text", len(text_content))
     else:
         raise HTTPException(status_code=400, detail="No text provided")
     
     try:
         result = await extract_financial_metrics_with_gpt4(text_content)
-        print(f"DEBUG - Test result: turnover={result.turnover}, admin_exp={result.administrative_expenses}")
+        logger.debug("Test result: turnover=%s admin_exp=%s", result.turnover, result.administrative_expenses)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Enhanced extraction failed: {str(e)}")
 
 
+@router.post("/batch-extract", status_code=202, dependencies=[Depends(require_api_key)])
+async def batch_extract(request: SkillRequest):
+    """
+    Submit records to the Azure OpenAI Batch API for non-interactive re-indexing.
+    Batch jobs are billed at half price but complete within 24h - collect the
+    results with GET /batch-extract/{batch_id}
+    """
+    
+    lines = []
+    skipped = []
+    
+    for value in request.values:
+        if value.data.text_sections:
+            text_content = extract_text_from_sections(value.data.text_sections, value.data.pre_cleaned)
+        else:
+            text_content = value.data.text or ""
+        
+        if len(text_content.strip()) < 10:
+            skipped.append(value.recordId)
+            continue
+        
+        lines.append(orjson.dumps({
+            "custom_id": value.recordId,
+            "method": "POST",
+            "url": "/chat/completions",
+            "body": {
+                "model": BATCH_DEPLOYMENT,
+                "messages": build_extraction_messages(await truncate_to_tokens(text_content)),
+                **EXTRACTION_PARAMS
+            }
+        }))
+    
+    if not lines:
+        raise HTTPException(status_code=400, detail="No text content provided")
+    
+    try:
+        batch_file = await _AOAI_CLIENT.files.create(
+            file=("financial-extraction.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await _AOAI_CLIENT.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/chat/completions",
+            completion_window="24h"
+        )
+    except Exception as e:
+        logger.error("Batch submission failed: %s", e)
+        raise HTTPException(status_code=502, detail=f"Batch submission failed: {str(e)}")
+    
+    logger.info("Submitted batch %s with %d records (%d skipped)", batch.id, len(lines), len(skipped))
+    
+    return {
+        "batch_id": batch.id,
+        "status": batch.status,
+        "submitted_records": len(lines),
+        "skipped_records": skipped
+    }
+
+
+def _batch_document_infos(input_jsonl: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Document type detection for each record of a batch, keyed by recordId.
+    The batch's own input file holds the submitted texts, so nothing has to be
+    kept between submission and collection.
+    """
+    documents = {}
+    for line in input_jsonl.splitlines():
+        if not line.strip():
+            continue
+        item = orjson.loads(line)
+        text = item["body"]["messages"][-1]["content"].removeprefix(EXTRACTION_TEXT_HEADER)
+        documents[item["custom_id"]] = detect_abridged_accounts(text)
+    return documents
+
+
+@router.get("/batch-extract/{batch_id}", dependencies=[Depends(require_api_key)])
+async def get_batch_extraction(batch_id: str):
+    """Poll a batch extraction job and return skill results once it has completed"""
+    
+    try:
+        batch = await _AOAI_CLIENT.batches.retrieve(batch_id)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Batch not found: {str(e)}")
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        return {
+            "batch_id": batch_id,
+            "status": batch.status,
+            "request_counts": batch.request_counts.model_dump() if batch.request_counts else None
+        }
+    
+    input_file, output_file = await asyncio.gather(
+        _AOAI_CLIENT.files.content(batch.input_file_id),
+        _AOAI_CLIENT.files.content(batch.output_file_id)
+    )
+    documents = await asyncio.to_thread(_batch_document_infos, input_file.text)
+    output = output_file.text
+    results = []
+    
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        
+        item = orjson.loads(line)
+        record_id = item["custom_id"]
+        response = item.get("response") or {}
+        
+        if item.get("error") or response.get("status_code") != 200:
+            results.append(RecordResult(
+                recordId=record_id,
+                data=EMPTY_FINANCIAL_DATA,
+                errors=[RecordError(message=f"Batch request failed: {item.get('error') or response.get('body')}")]
+            ))
+            continue
+        
+        document_info = documents.get(record_id) or {
+            "is_abridged": None,
+            "document_type": None,
+            "profit_loss_filed": None
+        }
+        result_text = response["body"]["choices"][0]["message"]["content"]
+        
+        try:
+            results.append(RecordResult(
+                recordId=record_id,
+                data=parse_financial_response(result_text, document_info)
+            ))
+        except orjson.JSONDecodeError as e:
+            results.append(RecordResult(
+                recordId=record_id,
+                data=EMPTY_FINANCIAL_DATA,
+                errors=[RecordError(message=f"Invalid JSON in batch response: {str(e)}")]
+            ))
+    
+    return SkillResponse(values=results)
+
+
 @router.get("/health")
 async def health_check():
     """Health check for enhanced financial extraction service"""
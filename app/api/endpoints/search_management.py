@@ -1,6 +1,8 @@
 
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
+from functools import lru_cache
+import asyncio
 import structlog
 
 from app.services.azure_search.manager import AzureSearchManager
@@ -8,12 +10,59 @@ from app.services.azure_search.manager import AzureSearchManager
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Backoff for polling deleted resources in /recreate-all, in seconds
+DELETE_POLL_INITIAL = 0.5
+DELETE_POLL_MAX = 4.0
+DELETE_POLL_TIMEOUT = 30.0
+
+
+@lru_cache(maxsize=1)
+def get_search_manager() -> AzureSearchManager:
+    """Shared AzureSearchManager - built on first use, a failed build is retried on the next call"""
+    return AzureSearchManager()
+
+
+async def _create_resources(manager: AzureSearchManager) -> Dict[str, str]:
+    """
+    Create all resources - data source, index and skillset don't depend on each other,
+    so they are created concurrently; the indexer references all three and goes last
+    """
+    logger.info("Creating data source, index and skillset...")
+    data_source, index, skillset = await asyncio.gather(
+        asyncio.to_thread(manager.create_data_source),
+        asyncio.to_thread(manager.create_search_index),
+        asyncio.to_thread(manager.create_skillset, use_combined_extraction=True)
+    )
+    
+    logger.info("Creating indexer...")
+    indexer = await asyncio.to_thread(manager.create_indexer)
+    
+    return {
+        "data_source": data_source,
+        "index": index,
+        "skillset": skillset,
+        "indexer": indexer
+    }
+
+async def _wait_for_deletion(manager: AzureSearchManager):
+    """Poll with exponential backoff until the deleted resources are gone, up to DELETE_POLL_TIMEOUT"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + DELETE_POLL_TIMEOUT
+    delay = DELETE_POLL_INITIAL
+    
+    while not await asyncio.to_thread(manager.resources_deleted):
+        if loop.time() + delay > deadline:
+            logger.warning("Resources still listed after deletion, recreating anyway")
+            return
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, DELETE_POLL_MAX)
+
 @router.post("/create-data-source")
 async def create_data_source():
     """Step 1: Create Azure Search data source"""
     try:
-        manager = AzureSearchManager()
-        result = manager.create_data_source()
+        manager = get_search_manager()
+        result = await asyncio.to_thread(manager.create_data_source)
         
         return {
             "status": "success",
@@ -29,8 +78,8 @@ async def create_data_source():
 async def create_index():
     """Step 2: Create Azure Search index"""
     try:
-        manager = AzureSearchManager()
-        result = manager.create_search_index()
+        manager = get_search_manager()
+        result = await asyncio.to_thread(manager.create_search_index)
         
         return {
             "status": "success", 
@@ -46,8 +95,8 @@ async def create_index():
 async def create_skillset(use_combined_extraction: bool = True):
     """Step 3: Create Azure Search skillset"""
     try:
-        manager = AzureSearchManager()
-        result = manager.create_skillset(use_combined_extraction=use_combined_extraction)
+        manager = get_search_manager()
+        result = await asyncio.to_thread(manager.create_skillset, use_combined_extraction=use_combined_extraction)
         
         return {
             "status": "success",
@@ -64,8 +113,8 @@ async def create_skillset(use_combined_extraction: bool = True):
 async def create_indexer():
     """Step 4: Create Azure Search indexer"""
     try:
-        manager = AzureSearchManager()
-        result = manager.create_indexer()
+        manager = get_search_manager()
+        result = await asyncio.to_thread(manager.create_indexer)
         
         return {
             "status": "success",
@@ -81,24 +130,8 @@ async def create_indexer():
 async def create_all_resources():
     """Create all Azure Search resources in correct order"""
     try:
-        manager = AzureSearchManager()
-        results = {}
-        
-        # Step 1: Data Source
-        logger.info("Creating data source...")
-        results["data_source"] = manager.create_data_source()
-        
-        # Step 2: Index
-        logger.info("Creating index...")
-        results["index"] = manager.create_search_index()
-        
-        # Step 3: Skillset
-        logger.info("Creating skillset...")
-        results["skillset"] = manager.create_skillset(use_combined_extraction=True)
-        
-        # Step 4: Indexer
-        logger.info("Creating indexer...")
-        results["indexer"] = manager.create_indexer()
+        manager = get_search_manager()
+        results = await _create_resources(manager)
         
         return {
             "status": "success",
@@ -114,8 +147,8 @@ async def create_all_resources():
 async def run_indexer():
     """Run the indexer to process documents"""
     try:
-        manager = AzureSearchManager()
-        success = manager.run_indexer()
+        manager = get_search_manager()
+        success = await asyncio.to_thread(manager.run_indexer)
         
         if success:
             return {
@@ -133,8 +166,8 @@ async def run_indexer():
 async def get_indexer_status():
     """Get current indexer status"""
     try:
-        manager = AzureSearchManager()
-        status = manager.get_indexer_status()
+        manager = get_search_manager()
+        status = await asyncio.to_thread(manager.get_indexer_status)
         
         return {
             "status": "success",
@@ -149,8 +182,8 @@ async def get_indexer_status():
 async def delete_all_resources():
     """Delete all Azure Search resources (cleanup)"""
     try:
-        manager = AzureSearchManager()
-        manager.delete_all_resources()
+        manager = get_search_manager()
+        await asyncio.to_thread(manager.delete_all_resources)
         
         return {
             "status": "success",
@@ -165,23 +198,18 @@ async def delete_all_resources():
 async def recreate_all_resources():
     """Delete existing resources and create new ones"""
     try:
-        manager = AzureSearchManager()
+        manager = get_search_manager()
         
         # Delete existing resources
         logger.info("Deleting existing resources...")
-        manager.delete_all_resources()
+        await asyncio.to_thread(manager.delete_all_resources)
         
-        # Wait a moment for deletion to complete
-        import asyncio
-        await asyncio.sleep(5)
+        # Wait for deletion to complete before reusing the names
+        await _wait_for_deletion(manager)
         
         # Create new resources
         logger.info("Creating new resources...")
-        results = {}
-        results["data_source"] = manager.create_data_source()
-        results["index"] = manager.create_search_index()
-        results["skillset"] = manager.create_skillset(use_combined_extraction=True)
-        results["indexer"] = manager.create_indexer()
+        results = await _create_resources(manager)
         
         return {
             "status": "success",
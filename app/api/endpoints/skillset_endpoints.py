@@ -1,24 +1,118 @@
 
-from typing import Dict, Any
-from fastapi import APIRouter, HTTPException
+from typing import Dict, Any, List
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+import asyncio
+import logging
+import orjson
 import structlog
 
 from app.services.skillset.metadata_extractor import ClubMetadataExtractor
 from app.services.skillset.text_cleaner import TextCleaningService  # NEW IMPORT
+from app.api.endpoints.financial_extraction import extract_financial_metrics_with_gpt4
 
 logger = structlog.get_logger()
+# The stdlib logger structlog's filter_by_level consults for this module - checking it first
+# skips building per-record log arguments that would only be dropped
+_log_level_logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.post("/extract-club-metadata")
-async def extract_club_metadata_skill(request_data: Dict[str, Any]):
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson - for routes that return plain dicts rather than a response_model"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+# Both services are stateless, so every request shares one instance
+metadata_extractor = ClubMetadataExtractor()
+text_cleaner = TextCleaningService()
+
+# FinancialData fields returned by /extract-financials-simple, in output mapping order
+SIMPLE_SKILL_FIELDS = (
+    "revenue",
+    "turnover",
+    "total_assets",
+    "total_liabilities",
+    "net_assets",
+    "cash_at_bank",
+    "cash_and_cash_equivalents",
+    "creditors_due_within_one_year",
+    "creditors_due_after_one_year",
+    "operating_profit",
+    "profit_loss_before_tax",
+    "broadcasting_revenue",
+    "commercial_revenue",
+    "matchday_revenue",
+    "player_trading_income",
+    "player_wages",
+    "player_amortization",
+    "other_staff_costs",
+    "stadium_costs",
+    "administrative_expenses",
+    "agent_fees"
+)
+NULL_FINANCIALS = dict.fromkeys(SIMPLE_SKILL_FIELDS)
+
+# Request body schema for the docs - skill_request_body reads the raw body, so FastAPI can't infer it
+SKILL_REQUEST_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "object",
+                    "required": ["values"],
+                    "properties": {
+                        "values": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "required": ["recordId"],
+                                "properties": {
+                                    "recordId": {"type": "string"},
+                                    "data": {"type": "object"}
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+async def skill_request_body(request: Request) -> Dict[str, Any]:
+    """
+    Parse an Azure Search skill request with orjson - batches of up to 1000 records skip
+    the stdlib json decoder and a Dict[str, Any] validation pass.
+    Only the envelope is checked here: 'values' must be a list of objects with a string
+    recordId. Record data stays loosely typed - the handlers read it with .get().
+    """
+    try:
+        request_data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid JSON body: {e}")
+    if not isinstance(request_data, dict):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON object")
+    
+    values = request_data.get('values')
+    if not isinstance(values, list):
+        raise HTTPException(status_code=422, detail="'values' must be a list of records")
+    for position, record in enumerate(values):
+        if not isinstance(record, dict) or not isinstance(record.get('recordId'), str):
+            raise HTTPException(status_code=422, detail=f"values[{position}] must be an object with a string recordId")
+    
+    return request_data
+
+@router.post("/extract-club-metadata", response_class=OrjsonResponse, openapi_extra=SKILL_REQUEST_OPENAPI)
+async def extract_club_metadata_skill(request_data: Dict[str, Any] = Depends(skill_request_body)):
     """
     Azure AI Search Custom Web API Skill
     Extracts club metadata from blob paths for search indexing
     """
     
     try:
-        extractor = ClubMetadataExtractor()
-        result = extractor.process_azure_search_request(request_data)
+        result = await asyncio.to_thread(metadata_extractor.process_azure_search_request, request_data)
         
         logger.info("Processed club metadata extraction", 
                    records_processed=len(result.get('values', [])))
@@ -36,15 +130,12 @@ async def test_metadata_extraction(blob_paths: list[str]):
     """
     
     try:
-        extractor = ClubMetadataExtractor()
-        results = []
-        
-        for path in blob_paths:
-            result = extractor.extract_from_blob_path(path)
-            results.append({
-                "blob_path": path,
-                "extracted_data": result
-            })
+        # One thread hop for the whole list - each path takes microseconds to parse
+        extracted = await asyncio.to_thread(lambda: [metadata_extractor.extract_from_blob_path(path) for path in blob_paths])
+        results = [
+            {"blob_path": path, "extracted_data": result}
+            for path, result in zip(blob_paths, extracted)
+        ]
         
         return {
             "total_processed": len(results),
@@ -56,8 +147,8 @@ async def test_metadata_extraction(blob_paths: list[str]):
         raise HTTPException(status_code=500, detail=str(e))
 
 # NEW ENDPOINT FOR TEXT CLEANING
-@router.post("/clean-text-sections")
-async def clean_text_sections_skill(request_data: Dict[str, Any]):
+@router.post("/clean-text-sections", response_class=OrjsonResponse, openapi_extra=SKILL_REQUEST_OPENAPI)
+async def clean_text_sections_skill(request_data: Dict[str, Any] = Depends(skill_request_body)):
     """
     Azure AI Search Custom Web API Skill
     Cleans and extracts readable text from JSON-formatted OCR output
@@ -67,8 +158,7 @@ async def clean_text_sections_skill(request_data: Dict[str, Any]):
     """
     
     try:
-        cleaner = TextCleaningService()
-        result = cleaner.process_azure_search_request(request_data)
+        result = await asyncio.to_thread(text_cleaner.process_azure_search_request, request_data)
         
         logger.info("Processed text cleaning", 
                    records_processed=len(result.get('values', [])))
@@ -81,185 +171,175 @@ async def clean_text_sections_skill(request_data: Dict[str, Any]):
 
 
 
-@router.post("/extract-financials-simple")
-async def extract_financials_simple_skill(request_data: Dict[str, Any]):
+async def _extract_simple_record(record: Dict[str, Any], extractions: Dict[str, asyncio.Task]) -> Dict[str, Any]:
     """
-    Azure AI Search Custom Web API Skill
-    Extract financials from clean text (from Text Cleaning skill)
+    Build the /extract-financials-simple result for one skill record.
+    Records with the same text share one extraction task from `extractions`.
     """
+    record_id = ''
+    
+    # The response is already streaming, so anything wrong with the record itself
+    # has to become an error entry here rather than escape the generator
     try:
-        from app.api.endpoints.financial_extraction import extract_financial_metrics_with_gpt4
+        record_id = record.get('recordId', '')
+        data = record.get('data', {})
         
-        values = request_data.get('values', [])
-        results = []
+        # FIXED: Get clean text from Text Cleaning skill output
+        # The text cleaning skill outputs 'cleaned_text', not 'text' or 'content'
+        text_content = data.get('cleaned_text', '')
         
-        for record in values:
-            record_id = record.get('recordId', '')
-            data = record.get('data', {})
-            
-            # FIXED: Get clean text from Text Cleaning skill output
-            # The text cleaning skill outputs 'cleaned_text', not 'text' or 'content'
-            text_content = data.get('cleaned_text', '')
-            
+        if _log_level_logger.isEnabledFor(logging.INFO):
             logger.info("Processing financial extraction from cleaned text", 
                        record_id=record_id,
                        text_length=len(text_content),
                        available_fields=list(data.keys()))
+        
+        if text_content and len(text_content.strip()) > 50:
+            # Extract financials using your existing GPT-4 function
+            if text_content not in extractions:
+                extractions[text_content] = asyncio.ensure_future(extract_financial_metrics_with_gpt4(text_content))
+            financial_data = await extractions[text_content]
             
-            try:
-                if text_content and len(text_content.strip()) > 50:
-                    # Extract financials using your existing GPT-4 function
-                    financial_data = await extract_financial_metrics_with_gpt4(text_content)
-                    
-                    # FIXED: Return data in the exact format your indexer expects
-                    results.append({
-                        "recordId": record_id,
-                        "data": {
-                            # Convert FinancialData object to dict for proper output mapping
-                            "revenue": financial_data.revenue,
-                            "turnover": financial_data.turnover,
-                            "total_assets": financial_data.total_assets,
-                            "total_liabilities": financial_data.total_liabilities,
-                            "net_assets": financial_data.net_assets,
-                            "cash_at_bank": financial_data.cash_at_bank,
-                            "cash_and_cash_equivalents": financial_data.cash_and_cash_equivalents,
-                            "creditors_due_within_one_year": financial_data.creditors_due_within_one_year,
-                            "creditors_due_after_one_year": financial_data.creditors_due_after_one_year,
-                            "operating_profit": financial_data.operating_profit,
-                            "profit_loss_before_tax": financial_data.profit_loss_before_tax,
-                            "broadcasting_revenue": financial_data.broadcasting_revenue,
-                            "commercial_revenue": financial_data.commercial_revenue,
-                            "matchday_revenue": financial_data.matchday_revenue,
-                            "player_trading_income": financial_data.player_trading_income,
-                            "player_wages": financial_data.player_wages,
-                            "player_amortization": financial_data.player_amortization,
-                            "other_staff_costs": financial_data.other_staff_costs,
-                            "stadium_costs": financial_data.stadium_costs,
-                            "administrative_expenses": financial_data.administrative_expenses,
-                            "agent_fees": financial_data.agent_fees
-                        },
-                        "errors": [],
-                        "warnings": []
-                    })
-                    
-                    logger.info("Successfully extracted financial data", 
-                               record_id=record_id,
-                               extracted_fields=len([v for v in financial_data.__dict__.values() if v is not None]))
-                    
-                else:
-                    # Handle insufficient text case
-                    logger.warning("Insufficient text for extraction", 
-                                 record_id=record_id,
-                                 text_length=len(text_content))
-                    
-                    results.append({
-                        "recordId": record_id,
-                        "data": {
-                            # Return null values for all fields when insufficient text
-                            "revenue": None,
-                            "turnover": None,
-                            "total_assets": None,
-                            "total_liabilities": None,
-                            "net_assets": None,
-                            "cash_at_bank": None,
-                            "cash_and_cash_equivalents": None,
-                            "creditors_due_within_one_year": None,
-                            "creditors_due_after_one_year": None,
-                            "operating_profit": None,
-                            "profit_loss_before_tax": None,
-                            "broadcasting_revenue": None,
-                            "commercial_revenue": None,
-                            "matchday_revenue": None,
-                            "player_trading_income": None,
-                            "player_wages": None,
-                            "player_amortization": None,
-                            "other_staff_costs": None,
-                            "stadium_costs": None,
-                            "administrative_expenses": None,
-                            "agent_fees": None
-                        },
-                        "errors": [],
-                        "warnings": [{"message": f"Insufficient text for extraction ({len(text_content)} chars)"}]
-                    })
-                    
-            except Exception as e:
-                logger.error("Financial extraction failed for record",
+            # FIXED: Return data in the exact format your indexer expects
+            result = {
+                "recordId": record_id,
+                # Convert FinancialData object to dict for proper output mapping
+                "data": {field: getattr(financial_data, field) for field in SIMPLE_SKILL_FIELDS},
+                "errors": [],
+                "warnings": []
+            }
+            
+            if _log_level_logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully extracted financial data", 
                            record_id=record_id,
-                           error=str(e))
-                
-                results.append({
-                    "recordId": record_id,
-                    "data": {
-                        # Return null values when extraction fails
-                        "revenue": None,
-                        "turnover": None,
-                        "total_assets": None,
-                        "total_liabilities": None,
-                        "net_assets": None,
-                        "cash_at_bank": None,
-                        "cash_and_cash_equivalents": None,
-                        "creditors_due_within_one_year": None,
-                        "creditors_due_after_one_year": None,
-                        "operating_profit": None,
-                        "profit_loss_before_tax": None,
-                        "broadcasting_revenue": None,
-                        "commercial_revenue": None,
-                        "matchday_revenue": None,
-                        "player_trading_income": None,
-                        "player_wages": None,
-                        "player_amortization": None,
-                        "other_staff_costs": None,
-                        "stadium_costs": None,
-                        "administrative_expenses": None,
-                        "agent_fees": None
-                    },
-                    "errors": [{"message": f"Extraction failed: {str(e)}"}],
-                    "warnings": []
-                })
+                           extracted_fields=sum(v is not None for v in result["data"].values()))
+            
+            return result
+            
+        else:
+            # Handle insufficient text case
+            logger.warning("Insufficient text for extraction", 
+                         record_id=record_id,
+                         text_length=len(text_content))
+            
+            return {
+                "recordId": record_id,
+                # Return null values for all fields when insufficient text
+                "data": NULL_FINANCIALS.copy(),
+                "errors": [],
+                "warnings": [{"message": f"Insufficient text for extraction ({len(text_content)} chars)"}]
+            }
+            
+    except Exception as e:
+        logger.error("Financial extraction failed for record",
+                   record_id=record_id,
+                   error=str(e))
+        
+        return {
+            "recordId": record_id,
+            # Return null values when extraction fails
+            "data": NULL_FINANCIALS.copy(),
+            "errors": [{"message": f"Extraction failed: {str(e)}"}],
+            "warnings": []
+        }
+
+
+async def _stream_simple_results(values: List[Dict[str, Any]]):
+    """
+    Yield the /extract-financials-simple response body as JSON bytes, one record as soon as
+    it is done - Azure Search matches results by recordId, so completion order is fine
+    """
+    # GPT-4 concurrency is capped inside the extraction module.
+    # Duplicate blobs in one batch carry the same text, so they wait on a single call.
+    extractions: Dict[str, asyncio.Task] = {}
+    successful = 0
+    
+    tasks = [asyncio.ensure_future(_extract_simple_record(record, extractions)) for record in values]
+    
+    try:
+        yield b'{"values":['
+        for i, next_result in enumerate(asyncio.as_completed(tasks)):
+            result = await next_result
+            if not result['errors']:
+                successful += 1
+            yield (b',' if i else b'') + orjson.dumps(result)
         
         logger.info("Completed financial extraction batch",
                    total_records=len(values),
-                   successful_extractions=len([r for r in results if not r.get('errors')]))
+                   successful_extractions=successful)
+        yield b']}'
+    finally:
+        # A client disconnect closes the generator early - stop the GPT-4 calls nobody will read
+        for task in [*tasks, *extractions.values()]:
+            if not task.done():
+                task.cancel()
+
+
+@router.post("/extract-financials-simple", openapi_extra=SKILL_REQUEST_OPENAPI)
+async def extract_financials_simple_skill(request_data: Dict[str, Any] = Depends(skill_request_body)):
+    """
+    Azure AI Search Custom Web API Skill
+    Extract financials from clean text (from Text Cleaning skill)
+    """
+    try:
+        values = request_data.get('values', [])
         
-        return {"values": results}
+        return StreamingResponse(_stream_simple_results(values), media_type="application/json")
         
     except Exception as e:
         logger.error("Financial extraction skill failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
     
     
-@router.post("/extract-financials-from-text-sections")
-async def extract_financials_from_text_sections_skill(request_data: Dict[str, Any]):
+def _section_content(section: Any):
+    """Text of a Document Intelligence section object or dict, None when it has none"""
+    # Request bodies are parsed JSON, so sections are dicts - test for that first
+    if isinstance(section, dict):
+        return section.get('content')
+    return getattr(section, 'content', None)
+
+
+@router.post("/extract-financials-from-text-sections", openapi_extra=SKILL_REQUEST_OPENAPI)
+async def extract_financials_from_text_sections_skill(request_data: Dict[str, Any] = Depends(skill_request_body)):
     """
     Combine Document Intelligence text sections and extract financial data
     Works with existing index structure (no projections needed)
     """
     try:
-        from app.api.endpoints.financial_extraction import extract_financial_metrics_with_gpt4
-        
         values = request_data.get('values', [])
         results = []
         
         for record in values:
             record_id = record.get('recordId', '')
-            text_sections = record.get('data', {}).get('text_sections', [])
-            
-            # Combine all text sections into one document
-            combined_text = ""
-            for section in text_sections:
-                if hasattr(section, 'content'):
-                    combined_text += section.content + "\n\n"
-                elif isinstance(section, dict) and 'content' in section:
-                    combined_text += section['content'] + "\n\n"
             
-            # Extract financials from combined text
-            if combined_text.strip():
-                financial_data = await extract_financial_metrics_with_gpt4(combined_text)
-                financial_dict = financial_data.dict()
-                # Remove None values
-                financial_dict = {k: v for k, v in financial_dict.items() if v is not None}
-            else:
-                financial_dict = {}
+            # A failure in one record (e.g. OpenAI still unavailable after retries) is reported for that record only
+            try:
+                text_sections = record.get('data', {}).get('text_sections', [])
+                
+                # Combine all text sections into one document
+                combined_text = "".join(
+                    content + "\n\n" for content in map(_section_content, text_sections) if content is not None
+                )
+                
+                # Extract financials from combined text
+                if combined_text.strip():
+                    financial_data = await extract_financial_metrics_with_gpt4(combined_text)
+                    # Remove None values
+                    financial_dict = financial_data.model_dump(exclude_none=True)
+                else:
+                    financial_dict = {}
+                
+            except Exception as e:
+                logger.error("Financial extraction from sections failed for record",
+                           record_id=record_id,
+                           error=str(e))
+                results.append({
+                    "recordId": record_id,
+                    "data": {},
+                    "errors": [{"message": f"Extraction failed: {str(e)}"}],
+                    "warnings": []
+                })
+                continue
             
             results.append({
                 "recordId": record_id,
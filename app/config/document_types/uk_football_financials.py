@@ -1,3 +1,6 @@
+import re
+from types import MappingProxyType
+
 
 UK_FOOTBALL_FINANCIAL_CONFIG = {
     "document_type": "uk_football_club_financial_statement",
@@ -477,4 +480,24 @@ UK_FOOTBALL_FINANCIAL_CONFIG = {
             "validation": "Football club revenue typically £1M-£500M range"
         }
     }
-}
\ No newline at end of file
+}
+
+# Regexes are compiled once at import, next to their source strings - the extractors
+# search them on every document
+for section in UK_FOOTBALL_FINANCIAL_CONFIG["document_structure"]["section_identifiers"].values():
+    for key in ("start_patterns", "end_patterns"):
+        if key in section:
+            section[f"{key}_compiled"] = [re.compile(pattern, re.IGNORECASE) for pattern in section[key]]
+
+
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Freeze last so nothing can mutate the patterns after their compiled siblings are built
+UK_FOOTBALL_FINANCIAL_CONFIG = _freeze(UK_FOOTBALL_FINANCIAL_CONFIG)
@@ -10,6 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.endpoints.api import api_router
 from app.api.endpoints import data_combiner
 from app.services.scheduler.championship_scheduler import ChampionshipScheduler
+from app.services.azure_search.blob_manager import BlobStorageManager
 
 # Configure structured logging
 structlog.configure(
@@ -71,8 +72,9 @@ async def startup_event():
 
 @app.on_event("shutdown") 
 async def shutdown_event():
-    """Stop scheduler on app shutdown"""
+    """Stop scheduler and release shared clients on app shutdown"""
     scheduler.stop_scheduler()
+    await BlobStorageManager.close()
     
     
 
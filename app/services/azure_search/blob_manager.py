@@ -2,9 +2,11 @@
 Azure Blob Storage manager for PDF documents
 """
 
+import asyncio
 import structlog
 from typing import Optional
-from azure.storage.blob.aio import BlobServiceClient
+from azure.storage.blob import ContentSettings
+from azure.storage.blob.aio import BlobServiceClient, ContainerClient
 from azure.core.exceptions import AzureError
 import os
 
@@ -14,35 +16,62 @@ logger = structlog.get_logger()
 class BlobStorageManager:
     """Manages PDF document uploads to Azure Blob Storage"""
     
+    # One client (and its connection pool) is shared by every manager instance
+    _client: Optional[BlobServiceClient] = None
+    _client_lock = asyncio.Lock()
+    
     def __init__(self):
         self.connection_string = os.getenv('AZURE_STORAGE_CONNECTION_STRING')
         self.container_name = os.getenv('AZURE_STORAGE_CONTAINER', 'financial-docs-container')
+        self._container: Optional[ContainerClient] = None
+        
+    async def _get_client(self) -> BlobServiceClient:
+        """Create the shared blob service client on first use"""
+        
+        cls = type(self)
+        if cls._client is None:
+            async with cls._client_lock:
+                if cls._client is None:
+                    cls._client = BlobServiceClient.from_connection_string(self.connection_string)
+        return cls._client
+    
+    async def _get_container(self) -> ContainerClient:
+        """Bind the target container once; it shares the client's pipeline"""
+        
+        if self._container is None:
+            blob_service = await self._get_client()
+            self._container = blob_service.get_container_client(self.container_name)
+        return self._container
+    
+    @classmethod
+    async def close(cls):
+        """Close the shared client on app shutdown"""
+        
+        if cls._client is not None:
+            client, cls._client = cls._client, None
+            await client.close()
         
     async def upload_pdf(self, blob_path: str, pdf_content: bytes) -> bool:
         """Upload PDF content to blob storage"""
         
         try:
-            async with BlobServiceClient.from_connection_string(
-                self.connection_string
-            ) as blob_service:
-                
-                blob_client = blob_service.get_blob_client(
-                    container=self.container_name,
-                    blob=blob_path
-                )
-                
-                # Upload with overwrite
-                await blob_client.upload_blob(
-                    pdf_content,
-                    overwrite=True,
-                    content_type='application/pdf'
-                )
-                
-                logger.info("PDF uploaded successfully",
-                           blob_path=blob_path,
-                           size_kb=len(pdf_content) // 1024)
-                
-                return True
+            container = await self._get_container()
+            
+            # Upload with overwrite; a known length keeps it a single Put Blob
+            await container.upload_blob(
+                name=blob_path,
+                data=pdf_content,
+                overwrite=True,
+                length=len(pdf_content),
+                max_concurrency=1,
+                content_settings=ContentSettings(content_type='application/pdf')
+            )
+            
+            logger.info("PDF uploaded successfully",
+                       blob_path=blob_path,
+                       size_kb=len(pdf_content) // 1024)
+            
+            return True
                 
         except AzureError as e:
             logger.error("Azure blob upload failed",
@@ -54,24 +83,3 @@ class BlobStorageManager:
                         blob_path=blob_path,
                         error=str(e))
             return False
-    
-    async def check_blob_exists(self, blob_path: str) -> bool:
-        """Check if a blob already exists"""
-        
-        try:
-            async with BlobServiceClient.from_connection_string(
-                self.connection_string
-            ) as blob_service:
-                
-                blob_client = blob_service.get_blob_client(
-                    container=self.container_name,
-                    blob=blob_path
-                )
-                
-                return await blob_client.exists()
-                
-        except Exception as e:
-            logger.error("Error checking blob existence",
-                        blob_path=blob_path,
-                        error=str(e))
-            return False
\ No newline at end of file
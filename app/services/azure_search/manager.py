@@ -562,4 +562,14 @@ class AzureSearchManager:
                 delete_func(resource_name)
                 logger.info(f"Deleted {resource_type}", name=resource_name)
             except Exception as e:
-                logger.warning(f"Failed to delete {resource_type}", name=resource_name, error=str(e))
\ No newline at end of file
+                logger.warning(f"Failed to delete {resource_type}", name=resource_name, error=str(e))
+
+    def resources_deleted(self) -> bool:
+        """True once none of the managed resources is listed by the service any more"""
+        remaining = (
+            self.indexer_name in self.indexer_client.get_indexer_names()
+            or self.skillset_name in self.indexer_client.get_skillset_names()
+            or self.index_name in self.index_client.list_index_names()
+            or self.datasource_name in self.indexer_client.get_data_source_connection_names()
+        )
+        return not remaining
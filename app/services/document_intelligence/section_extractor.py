@@ -6,6 +6,25 @@ from app.config.document_types.uk_football_financials import UK_FOOTBALL_FINANCI
 
 logger = structlog.get_logger()
 
+# Section boundaries that aren't in the config, compiled once at import
+BALANCE_SHEET_END_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in ["Statement of changes in equity", "Statement of cash flows", "Notes to the"]
+]
+NOTES_END_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in ["This document was delivered", "END OF DOCUMENT", "Company registration number"]
+]
+# Note 3 or Turnover section
+TURNOVER_NOTE_PATTERNS = [
+    re.compile(pattern, re.DOTALL | re.IGNORECASE)
+    for pattern in [
+        r"3[\s\n]+Turnover.*?(?=\n\s*\d+\s+\w+|\n\s*4\s+|\Z)",
+        r"Turnover analysed by class.*?(?=\n\s*\d+\s+\w+|\n\s*4\s+|\Z)",
+        r"Turnover and other revenue.*?(?=\n\s*\d+\s+\w+|\n\s*4\s+|\Z)"
+    ]
+]
+
 class FinancialSectionExtractor:
     """
     Extracts specific sections from UK football club financial statements
@@ -43,8 +62,8 @@ class FinancialSectionExtractor:
         """
         return self._extract_section(
             text,
-            self.section_config['profit_loss']['start_patterns'],
-            self.section_config['profit_loss']['end_patterns']
+            self.section_config['profit_loss']['start_patterns_compiled'],
+            self.section_config['profit_loss']['end_patterns_compiled']
         )
     
     def extract_balance_sheet(self, text: str) -> str:
@@ -53,8 +72,8 @@ class FinancialSectionExtractor:
         """
         return self._extract_section(
             text,
-            self.section_config['balance_sheet']['start_patterns'],
-            ["Statement of changes in equity", "Statement of cash flows", "Notes to the"]
+            self.section_config['balance_sheet']['start_patterns_compiled'],
+            BALANCE_SHEET_END_PATTERNS
         )
     
     def extract_notes(self, text: str) -> str:
@@ -63,8 +82,8 @@ class FinancialSectionExtractor:
         """
         return self._extract_section(
             text,
-            self.section_config['notes']['start_patterns'],
-            ["This document was delivered", "END OF DOCUMENT", "Company registration number"]
+            self.section_config['notes']['start_patterns_compiled'],
+            NOTES_END_PATTERNS
         )
     
     def extract_turnover_breakdown(self, text: str) -> str:
@@ -74,27 +93,21 @@ class FinancialSectionExtractor:
         notes_text = self.extract_notes(text)
         
         # Look for Note 3 or Turnover section
-        patterns = [
-            r"3[\s\n]+Turnover.*?(?=\n\s*\d+\s+\w+|\n\s*4\s+|\Z)",
-            r"Turnover analysed by class.*?(?=\n\s*\d+\s+\w+|\n\s*4\s+|\Z)",
-            r"Turnover and other revenue.*?(?=\n\s*\d+\s+\w+|\n\s*4\s+|\Z)"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, notes_text, re.DOTALL | re.IGNORECASE)
+        for pattern in TURNOVER_NOTE_PATTERNS:
+            match = pattern.search(notes_text)
             if match:
                 return match.group(0)
         
         return ""
     
-    def _extract_section(self, text: str, start_patterns: List[str], end_patterns: List[str]) -> str:
+    def _extract_section(self, text: str, start_patterns: List[re.Pattern], end_patterns: List[re.Pattern]) -> str:
         """
-        Generic section extraction between start and end patterns
+        Generic section extraction between start and end patterns (compiled case-insensitive)
         """
         # Find start position
         start_pos = None
         for pattern in start_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 start_pos = match.start()
                 break
@@ -102,12 +115,12 @@ class FinancialSectionExtractor:
         if start_pos is None:
             return ""
         
-        # Find end position
+        # Find end position - searching from start_pos avoids copying the rest of the text
         end_pos = len(text)
         for pattern in end_patterns:
-            match = re.search(pattern, text[start_pos:], re.IGNORECASE)
+            match = pattern.search(text, start_pos)
             if match:
-                end_pos = start_pos + match.start()
+                end_pos = match.start()
                 break
         
         return text[start_pos:end_pos]
@@ -6,6 +6,97 @@ from app.config.document_types.uk_football_financials import UK_FOOTBALL_FINANCI
 
 logger = structlog.get_logger()
 
+
+def _compile_field_patterns(field_patterns: Dict[str, List[str]]) -> Dict[str, List[re.Pattern]]:
+    """Compile each field's fallback patterns once, in order"""
+    return {
+        field_name: [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in patterns]
+        for field_name, patterns in field_patterns.items()
+    }
+
+# Key P&L fields to extract
+PL_FIELD_PATTERNS = _compile_field_patterns({
+    'turnover': [
+        r'Turnover\s+(?:3\s+)?[\s\n]*([\d,]+)',
+        r'Turnover\s+£?\s*([\d,]+)',
+        r'Revenue\s+£?\s*([\d,]+)'
+    ],
+    'cost_of_sales': [
+        r'Cost of sales\s+\(([\d,]+)\)',
+        r'Cost of sales\s+£?\s*\(([\d,]+)\)'
+    ],
+    'gross_profit': [
+        r'Gross profit(?:/\(loss\))?\s+([\d,]+)',
+        r'Gross profit\s+£?\s*([\d,]+)'
+    ],
+    'administrative_expenses': [
+        r'Administrative expenses\s+\(([\d,]+)\)',
+        r'Administrative expenses\s+£?\s*\(([\d,]+)\)'
+    ],
+    'operating_profit': [
+        r'Operating (?:profit|loss)\s+\(([\d,]+)\)',
+        r'Operating (?:profit|loss)\s+([\d,]+)',
+        r'Operating profit/\(loss\)\s+\(([\d,]+)\)'
+    ],
+    'profit_loss_before_tax': [
+        r'(?:Profit|Loss) before tax(?:ation)?\s+\(([\d,]+)\)',
+        r'(?:Profit|Loss) before tax(?:ation)?\s+([\d,]+)',
+        r'Loss for the financial year\s+\(([\d,]+)\)'
+    ]
+})
+
+# Key balance sheet fields to extract
+BS_FIELD_PATTERNS = _compile_field_patterns({
+    'total_assets': [
+        r'Total assets\s+£?\s*([\d,]+)',
+        r'Fixed assets[\s\S]*?Current assets[\s\S]*?(?:Total|£)\s+([\d,]+)'
+    ],
+    'cash_at_bank': [
+        r'Cash at bank and in hand\s+£?\s*([\d,]+)',
+        r'Cash and cash equivalents\s+£?\s*([\d,]+)',
+        r'Cash\s+£?\s*([\d,]+)'
+    ],
+    'creditors_due_within_one_year': [
+        r'Creditors:\s*amounts falling due within one year\s+\(([\d,]+)\)',
+        r'Creditors due within one year\s+\(([\d,]+)\)',
+        r'Current liabilities\s+\(([\d,]+)\)'
+    ],
+    'creditors_due_after_one_year': [
+        r'Creditors:\s*amounts falling due after (?:more than )?one year\s+\(([\d,]+)\)',
+        r'(?:Creditors|amounts) falling due after (?:more than )?one year\s+\(([\d,]+)\)',
+        r'Non-current liabilities\s+\(([\d,]+)\)'
+    ],
+    'net_assets': [
+        r'Net assets\s+£?\s*([\d,]+)',
+        r'Net liabilities\s+\(([\d,]+)\)',
+        r'Net assets/\(liabilities\)\s+\(([\d,]+)\)',
+        r'Total equity\s+\(([\d,]+)\)'
+    ],
+    'net_current_liabilities': [
+        r'Net current (?:assets|liabilities)\s+\(([\d,]+)\)',
+        r'Net current (?:assets|liabilities)\s+([\d,]+)'
+    ]
+})
+
+# Revenue breakdown fields from the notes
+REVENUE_FIELD_PATTERNS = _compile_field_patterns({
+    'matchday_revenue': [
+        r'Matchday(?:\s+(?:Admissions|income))?\s+£?\s*([\d,]+)',
+        r'Gate receipts\s+£?\s*([\d,]+)',
+        r'Matchday\s+[\d,]+\s+£?\s*([\d,]+)'  # For year comparisons
+    ],
+    'broadcasting_revenue': [
+        r'Broadcasting(?:\s+revenue)?\s+£?\s*([\d,]+)',
+        r'TV revenue\s+£?\s*([\d,]+)',
+        r'Media revenue\s+£?\s*([\d,]+)'
+    ],
+    'commercial_revenue': [
+        r'Commercial(?:\s+revenue)?\s+£?\s*([\d,]+)',
+        r'Sponsorship and Advertising\s+£?\s*([\d,]+)',
+        r'Sponsorship\s+£?\s*([\d,]+)'
+    ]
+})
+
 class UKFinancialFieldExtractor:
     """
     Extracts financial fields with UK accounting format understanding
@@ -51,38 +142,7 @@ class UKFinancialFieldExtractor:
         """
         fields = {}
         
-        # Key P&L fields to extract
-        pl_patterns = {
-            'turnover': [
-                r'Turnover\s+(?:3\s+)?[\s\n]*([\d,]+)',
-                r'Turnover\s+£?\s*([\d,]+)',
-                r'Revenue\s+£?\s*([\d,]+)'
-            ],
-            'cost_of_sales': [
-                r'Cost of sales\s+\(([\d,]+)\)',
-                r'Cost of sales\s+£?\s*\(([\d,]+)\)'
-            ],
-            'gross_profit': [
-                r'Gross profit(?:/\(loss\))?\s+([\d,]+)',
-                r'Gross profit\s+£?\s*([\d,]+)'
-            ],
-            'administrative_expenses': [
-                r'Administrative expenses\s+\(([\d,]+)\)',
-                r'Administrative expenses\s+£?\s*\(([\d,]+)\)'
-            ],
-            'operating_profit': [
-                r'Operating (?:profit|loss)\s+\(([\d,]+)\)',
-                r'Operating (?:profit|loss)\s+([\d,]+)',
-                r'Operating profit/\(loss\)\s+\(([\d,]+)\)'
-            ],
-            'profit_loss_before_tax': [
-                r'(?:Profit|Loss) before tax(?:ation)?\s+\(([\d,]+)\)',
-                r'(?:Profit|Loss) before tax(?:ation)?\s+([\d,]+)',
-                r'Loss for the financial year\s+\(([\d,]+)\)'
-            ]
-        }
-        
-        for field_name, patterns in pl_patterns.items():
+        for field_name, patterns in PL_FIELD_PATTERNS.items():
             value = self._extract_with_patterns(text, patterns)
             if value is not None:
                 # Check if it's negative (in parentheses)
@@ -98,39 +158,7 @@ class UKFinancialFieldExtractor:
         """
         fields = {}
         
-        bs_patterns = {
-            'total_assets': [
-                r'Total assets\s+£?\s*([\d,]+)',
-                r'Fixed assets[\s\S]*?Current assets[\s\S]*?(?:Total|£)\s+([\d,]+)'
-            ],
-            'cash_at_bank': [
-                r'Cash at bank and in hand\s+£?\s*([\d,]+)',
-                r'Cash and cash equivalents\s+£?\s*([\d,]+)',
-                r'Cash\s+£?\s*([\d,]+)'
-            ],
-            'creditors_due_within_one_year': [
-                r'Creditors:\s*amounts falling due within one year\s+\(([\d,]+)\)',
-                r'Creditors due within one year\s+\(([\d,]+)\)',
-                r'Current liabilities\s+\(([\d,]+)\)'
-            ],
-            'creditors_due_after_one_year': [
-                r'Creditors:\s*amounts falling due after (?:more than )?one year\s+\(([\d,]+)\)',
-                r'(?:Creditors|amounts) falling due after (?:more than )?one year\s+\(([\d,]+)\)',
-                r'Non-current liabilities\s+\(([\d,]+)\)'
-            ],
-            'net_assets': [
-                r'Net assets\s+£?\s*([\d,]+)',
-                r'Net liabilities\s+\(([\d,]+)\)',
-                r'Net assets/\(liabilities\)\s+\(([\d,]+)\)',
-                r'Total equity\s+\(([\d,]+)\)'
-            ],
-            'net_current_liabilities': [
-                r'Net current (?:assets|liabilities)\s+\(([\d,]+)\)',
-                r'Net current (?:assets|liabilities)\s+([\d,]+)'
-            ]
-        }
-        
-        for field_name, patterns in bs_patterns.items():
+        for field_name, patterns in BS_FIELD_PATTERNS.items():
             value = self._extract_with_patterns(text, patterns)
             if value is not None:
                 # Special handling for creditors and liabilities
@@ -151,37 +179,19 @@ class UKFinancialFieldExtractor:
         """
         fields = {}
         
-        revenue_patterns = {
-            'matchday_revenue': [
-                r'Matchday(?:\s+(?:Admissions|income))?\s+£?\s*([\d,]+)',
-                r'Gate receipts\s+£?\s*([\d,]+)',
-                r'Matchday\s+[\d,]+\s+£?\s*([\d,]+)'  # For year comparisons
-            ],
-            'broadcasting_revenue': [
-                r'Broadcasting(?:\s+revenue)?\s+£?\s*([\d,]+)',
-                r'TV revenue\s+£?\s*([\d,]+)',
-                r'Media revenue\s+£?\s*([\d,]+)'
-            ],
-            'commercial_revenue': [
-                r'Commercial(?:\s+revenue)?\s+£?\s*([\d,]+)',
-                r'Sponsorship and Advertising\s+£?\s*([\d,]+)',
-                r'Sponsorship\s+£?\s*([\d,]+)'
-            ]
-        }
-        
-        for field_name, patterns in revenue_patterns.items():
+        for field_name, patterns in REVENUE_FIELD_PATTERNS.items():
             value = self._extract_with_patterns(text, patterns)
             if value is not None:
                 fields[field_name] = value
         
         return fields
     
-    def _extract_with_patterns(self, text: str, patterns: List[str]) -> Optional[float]:
+    def _extract_with_patterns(self, text: str, patterns: List[re.Pattern]) -> Optional[float]:
         """
-        Try multiple patterns to extract a numeric value
+        Try multiple compiled patterns to extract a numeric value
         """
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+            match = pattern.search(text)
             if match:
                 # Extract the number
                 number_str = match.group(1)
@@ -204,17 +214,8 @@ class UKFinancialFieldExtractor:
         """
         # Look for the value in parentheses
         value_str = f"{int(value):,}"
-        patterns = [
-            rf'\({value_str}\)',
-            rf'\(£{value_str}\)',
-            rf'\(£?\s*{value_str}\)'
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, text):
-                return True
-        
-        return False
+        # Covers (1,234), (£1,234) and (£ 1,234) in one pass
+        return re.search(rf'\(£?\s*{value_str}\)', text) is not None
     
     def apply_post_processing(self, fields: Dict[str, Any]) -> Dict[str, Any]:
         """
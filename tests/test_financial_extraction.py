@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import orjson
+
+from app.api.endpoints import financial_extraction
+from app.api.endpoints.financial_extraction import FinancialData
+
+
+def test_batch_keeps_successful_records_when_a_retry_fails():
+    async def stream_completion(*args, **kwargs):
+        raise RuntimeError("combined call failed")
+
+    async def extract(text):
+        if text == "bad":
+            raise RuntimeError("rate limited")
+        return FinancialData(turnover=1000.0)
+
+    with patch.object(financial_extraction, "_AOAI_CLIENT", object()), \
+            patch.object(financial_extraction, "_stream_completion", stream_completion), \
+            patch.object(financial_extraction, "extract_financial_metrics_with_gpt4", extract):
+        results = asyncio.run(financial_extraction.extract_financial_metrics_batch(["good", "bad"]))
+
+    assert results[0].turnover == 1000.0
+    assert results[1] is None
+
+
+def _keyword_text(count):
+    # Line-item keywords only, so no statement title is present
+    keywords = [k for k in financial_extraction.FINANCIAL_KEYWORDS
+                if not any(title in k for title in financial_extraction.STATEMENT_TITLES)]
+    return "Directors' report. " + " ".join(keywords[:count])
+
+
+def _run_extract_financials(texts):
+    async def extract_group(group, values):
+        return [financial_extraction.RecordResult(recordId=values[i].recordId, data=FinancialData(turnover=1.0))
+                for i, _ in group]
+
+    request = financial_extraction.SkillRequest(values=[
+        {"recordId": str(i), "data": {"text": text}} for i, text in enumerate(texts)
+    ])
+    with patch.object(financial_extraction, "_extract_group", extract_group):
+        return asyncio.run(financial_extraction.extract_financials(request)).values
+
+
+def test_records_at_the_keyword_threshold_are_extracted():
+    threshold = financial_extraction.MIN_FINANCIAL_KEYWORDS
+    below, at = _run_extract_financials([_keyword_text(threshold - 1), _keyword_text(threshold)])
+
+    assert below.data == financial_extraction.EMPTY_FINANCIAL_DATA
+    assert below.warnings[0].message == "Skipped: no financial statement content"
+    assert at.data.turnover == 1.0 and not at.warnings
+
+
+def test_statement_with_few_keywords_is_not_skipped():
+    statement = (
+        "Statement of financial position as at 31 May 2024\n"
+        "Fixed assets 1,200,000\nCurrent assets 350,000\nNet assets 1,550,000"
+    )
+    [result] = _run_extract_financials([statement])
+
+    assert result.data.turnover == 1.0 and not result.warnings
+
+
+class _FakeBatchClient:
+    """Just enough of the Azure OpenAI files/batches API to submit and collect one batch"""
+
+    def __init__(self):
+        self.files = self
+        self.batches = self
+        self.uploads = {}
+
+    async def create(self, file=None, purpose=None, **kwargs):
+        if file is not None:
+            self.uploads["input"] = file[1].decode()
+            return SimpleNamespace(id="input")
+        return SimpleNamespace(id="batch-1", status="validating")
+
+    async def retrieve(self, batch_id):
+        return SimpleNamespace(status="completed", input_file_id="input", output_file_id="output")
+
+    async def content(self, file_id):
+        return SimpleNamespace(text=self.uploads[file_id])
+
+
+def test_batch_results_keep_document_type_without_cache():
+    client = _FakeBatchClient()
+    request = financial_extraction.SkillRequest(values=[
+        {"recordId": "abridged", "data": {"text": "Unaudited abridged accounts. Balance sheet net assets 1,000"}}
+    ])
+
+    with patch.object(financial_extraction, "_AOAI_CLIENT", client):
+        asyncio.run(financial_extraction.batch_extract(request))
+        client.uploads["output"] = orjson.dumps({
+            "custom_id": "abridged",
+            "response": {"status_code": 200, "body": {"choices": [{"message": {"content": '{"net_assets": 1000}'}}]}}
+        }).decode()
+        [result] = asyncio.run(financial_extraction.get_batch_extraction("batch-1")).values
+
+    assert result.data.net_assets == 1000
+    assert result.data.is_abridged is True
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.endpoints import skillset_endpoints
+from app.api.endpoints.financial_extraction import FinancialData
+
+
+app = FastAPI()
+app.include_router(skillset_endpoints.router)
+client = TestClient(app)
+
+
+def test_extract_financials_simple_malformed_records_return_complete_body():
+    response = client.post("/extract-financials-simple", json={
+        "values": [
+            {"recordId": "1", "data": None},
+            {"recordId": "2", "data": "not an object"},
+            {"recordId": "3", "data": {"cleaned_text": "too short"}}
+        ]
+    })
+
+    assert response.status_code == 200
+    body = orjson.loads(response.content)
+    results = {value["recordId"]: value for value in body["values"]}
+    assert set(results) == {"1", "2", "3"}
+    assert results["1"]["errors"]
+    assert results["2"]["errors"]
+    assert results["1"]["data"] == skillset_endpoints.NULL_FINANCIALS
+    assert not results["3"]["errors"] and results["3"]["warnings"]
+
+
+def test_extract_financials_simple_rejects_non_list_values_before_streaming():
+    response = client.post("/extract-financials-simple", json={"values": None})
+
+    assert response.status_code == 422
+
+
+def test_extract_financials_from_text_sections_isolates_record_failures():
+    async def extract(text):
+        if "fails" in text:
+            raise RuntimeError("rate limited")
+        return FinancialData(turnover=1000.0)
+
+    with patch.object(skillset_endpoints, "extract_financial_metrics_with_gpt4", extract):
+        response = client.post("/extract-financials-from-text-sections", json={
+            "values": [
+                {"recordId": "1", "data": {"text_sections": [{"content": "Turnover 1,000"}]}},
+                {"recordId": "2", "data": {"text_sections": [{"content": "this record fails"}]}}
+            ]
+        })
+
+    assert response.status_code == 200
+    results = {value["recordId"]: value for value in response.json()["values"]}
+    assert results["1"]["data"] == {"turnover": 1000.0} and not results["1"]["errors"]
+    assert results["2"]["errors"] and results["2"]["data"] == {}
+
+
+def test_skill_request_body_requires_record_ids():
+    response = client.post("/clean-text-sections", json={"values": [{"data": {}}]})
+
+    assert response.status_code == 422
+
+
+def test_skill_request_schema_is_documented():
+    request_body = client.get("/openapi.json").json()["paths"]["/extract-financials-simple"]["post"]["requestBody"]
+
+    assert request_body["content"]["application/json"]["schema"]["required"] == ["values"]
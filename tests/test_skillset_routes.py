@@ -0,0 +1,8 @@
+from app.api.endpoints import skillset_endpoints
+
+
+def test_extract_financials_simple_is_registered_once():
+    routes = [route for route in skillset_endpoints.router.routes
+              if getattr(route, "path", None) == "/extract-financials-simple"]
+
+    assert len(routes) == 1